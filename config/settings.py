@@ -25,6 +25,9 @@ class Settings:
     EXPORTS_DIR = DATA_DIR / "exports"
     ASSETS_DIR = ROOT_DIR / "assets"
     
+    # Directorios que ensure_directories debe crear
+    _REQUIRED_DIRS = (DATA_DIR, DATABASE_DIR, LOGS_DIR, EXPORTS_DIR)
+    
     # Configuración General
     APP_NAME = os.getenv("APP_NAME", "SGDI")
     APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
@@ -41,6 +44,7 @@ class Settings:
     DB_USER = os.getenv("DB_USER", "root")
     DB_PASSWORD = os.getenv("DB_PASSWORD", "root")
     DB_CHARSET = os.getenv("DB_CHARSET", "utf8mb4")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
     
     # Rutas de Trabajo
     DEFAULT_EXPORT_PATH = os.getenv("DEFAULT_EXPORT_PATH", "C:/SGDI/exports")
@@ -56,15 +60,19 @@ class Settings:
     QR_ERROR_CORRECTION = os.getenv("QR_ERROR_CORRECTION", "H")
     
     # Configuración INACAL
-    INACAL_CODES_PATH = os.getenv(
+    INACAL_CODES_PATH = Path(os.getenv(
         "INACAL_CODES_PATH",
         "C:/INACAL-PDF/codigos_unicos.txt"
-    )
+    ))
     INACAL_EXPORT_PATH = os.getenv("INACAL_EXPORT_PATH", "C:/INACAL-PDF")
     
     # Configuración UI
     THEME = os.getenv("THEME", "darkly")
     WINDOW_SIZE = os.getenv("WINDOW_SIZE", "1400x900")
+    # (ancho, alto) de WINDOW_SIZE, parseado una sola vez
+    WINDOW_WH = tuple(map(int, WINDOW_SIZE.split('x')))
+    # Geometría de la ventana guardada al cerrar la sesión anterior
+    WINDOW_GEOMETRY_FILE = DATA_DIR / "window_geometry.txt"
     WINDOW_TITLE = os.getenv(
         "WINDOW_TITLE",
         f"{APP_NAME} v{APP_VERSION} - Sistema de Gestión Documental Integral"
@@ -75,18 +83,19 @@ class Settings:
     LOG_MAX_SIZE_MB = int(os.getenv("LOG_MAX_SIZE_MB", "10"))
     LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
     
+    # Indica si ensure_directories ya se ejecutó en este proceso
+    _dirs_ready = False
+    
     @classmethod
     def ensure_directories(cls):
-        """Crea los directorios necesarios si no existen."""
-        directories = [
-            cls.DATA_DIR,
-            cls.DATABASE_DIR,
-            cls.LOGS_DIR,
-            cls.EXPORTS_DIR,
-        ]
+        """Crea los directorios necesarios si no existen (una vez por proceso)."""
+        if cls._dirs_ready:
+            return
+        
+        for directory in cls._REQUIRED_DIRS:
+            os.makedirs(directory, exist_ok=True)
         
-        for directory in directories:
-            Path(directory).mkdir(parents=True, exist_ok=True)
+        cls._dirs_ready = True
     
     @classmethod
     def get_info(cls):
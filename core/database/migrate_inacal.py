@@ -2,28 +2,83 @@
 SGDI - Script de Migración de Códigos INACAL
 =============================================
 
-Migra los códigos existentes desde el archivo TXT a la base de datos SQLite.
+Migra los códigos existentes desde el archivo TXT a la base de datos MySQL.
+
+Usa una conexión propia en modo masivo (Database.set_bulk_mode) e inserta
+por lotes con INSERT IGNORE (Database.bulk_insert): UNIQUE(code) descarta
+los códigos que ya estaban registrados.
 """
 
-import os
+import re
 import sys
 from pathlib import Path
 
 # Agregar directorio raíz al path
-ROOT_DIR = Path(__file__).parent
+ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
-from core.database.simple_db import get_db
+from core.database.simple_db import Database, get_db
 from core.utils.logger import get_logger
 from config.settings import Settings
 
 log = get_logger(__name__)
 
 
+# Buffer de lectura del archivo INACAL (1 MB)
+READ_BUFFER_SIZE = 1 << 20
+
+# Tamaño de lote para executemany (evita exceder max_allowed_packet de MySQL)
+BATCH_SIZE = 5000
+
+MIGRATION_NOTE = "Migrado desde archivo histórico"
+
+# Cantidad de líneas mal formateadas que se reportan como muestra
+MAX_ERROR_SAMPLES = 10
+
+# Línea válida: "Artículo|CÓDIGO" con un solo separador y ambos campos no
+# vacíos; los espacios de los extremos se descartan (como con strip())
+LINE_PATTERN = re.compile(r'^\s*([^|\s][^|\r\n]*?)\s*\|\s*([^|\s](?:[^|\r\n]*[^|\s])?)\s*$')
+
+
+def _iter_inacal_rows(lines, stats: dict):
+    """
+    Genera las filas a insertar a partir de las líneas del archivo INACAL.
+    
+    Args:
+        lines: Iterable de líneas (formato: Artículo|CÓDIGO)
+        stats: Diccionario donde se acumulan 'valid', 'errors' y
+            'error_lines' (muestra de líneas mal formateadas)
+        
+    Yields:
+        Tuplas (code, article_name, notes)
+    """
+    for line_number, line in enumerate(lines, 1):
+        # Ignorar líneas vacías
+        if not line or line.isspace():
+            continue
+        
+        # Parsear la línea (formato: Artículo|CÓDIGO) en una sola pasada
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            # Solo se guardan algunas líneas de muestra para el resumen final
+            if stats['errors'] < MAX_ERROR_SAMPLES:
+                stats['error_lines'].append(line_number)
+            stats['errors'] += 1
+            continue
+        
+        article_name, code = match.groups()
+        
+        stats['valid'] += 1
+        yield code, article_name, MIGRATION_NOTE
+
+
 def migrate_inacal_codes():
     """
     Migra los códigos INACAL desde el archivo TXT a la base de datos.
     
+    Las filas se insertan por lotes con INSERT IGNORE dentro de una única
+    transacción; la restricción UNIQUE de `code` descarta los duplicados.
+    
     Returns:
         Tupla (códigos_migrados, códigos_duplicados, errores)
     """
@@ -35,69 +90,39 @@ def migrate_inacal_codes():
     log.info(f"Archivo fuente: {inacal_file}")
     
     # Verificar que el archivo existe
-    if not os.path.exists(inacal_file):
+    if not inacal_file.exists():
         log.warning(f"Archivo INACAL no encontrado: {inacal_file}")
         log.info("Se omite la migración. El sistema funcionará sin códigos históricos.")
         return 0, 0, 0
     
-    # Conectar a la base de datos
-    db = get_db()
+    # Conexión propia para la carga masiva (sin gap locks)
+    db = Database()
+    db.set_bulk_mode(True)
     
     migrated = 0
     duplicates = 0
-    errors = 0
+    stats = {'valid': 0, 'errors': 0, 'error_lines': []}
     
     try:
-        with open(inacal_file, 'r', encoding='utf-8') as f:
-            for line_number, line in enumerate(f, 1):
-                line = line.strip()
-                
-                # Ignorar líneas vacías
-                if not line:
-                    continue
-                
-                # Parsear la línea (formato: Artículo|CÓDIGO)
-                if '|' not in line:
-                    log.warning(f"Línea {line_number} con formato incorrecto: {line}")
-                    errors += 1
-                    continue
-                
-                parts = line.split('|')
-                if len(parts) != 2:
-                    log.warning(f"Línea {line_number} con formato incorrecto: {line}")
-                    errors += 1
-                    continue
-                
-                article_name = parts[0].strip()
-                code = parts[1].strip()
-                
-                # Validar que el código no esté vacío
-                if not code or not article_name:
-                    log.warning(f"Línea {line_number} con datos vacíos: {line}")
-                    errors += 1
-                    continue
-                
-                # Verificar si el código ya existe
-                if db.code_exists(code):
-                    log.debug(f"Código duplicado (omitido): {code}")
-                    duplicates += 1
-                    continue
-                
-                # Insertar en la base de datos
-                try:
-                    db.save_generated_code(
-                        code=code,
-                        article_name=article_name,
-                        notes="Migrado desde archivo histórico"
-                    )
-                    migrated += 1
-                    
-                    if migrated % 100 == 0:
-                        log.info(f"Progreso: {migrated} códigos migrados...")
-                        
-                except Exception as e:
-                    log.error(f"Error al insertar código {code}: {e}")
-                    errors += 1
+        with open(inacal_file, 'r', encoding='utf-8',
+                  buffering=READ_BUFFER_SIZE, newline='') as f:
+            rows = _iter_inacal_rows(f, stats)
+            
+            migrated = db.bulk_insert(
+                'generated_codes',
+                ['code', 'article_name', 'notes'],
+                rows,
+                chunk_size=BATCH_SIZE,
+                ignore=True
+            )
+        
+        # Las filas válidas que INSERT IGNORE descartó son duplicados
+        duplicates = stats['valid'] - migrated
+        errors = stats['errors']
+        
+        if errors:
+            sample = ', '.join(map(str, stats['error_lines']))
+            log.warning(f"{errors} líneas mal formateadas (ej. líneas: {sample})")
         
         # Resumen
         log.info("="*60)
@@ -127,7 +152,10 @@ def migrate_inacal_codes():
     except Exception as e:
         log.error(f"Error durante la migración: {e}")
         log.exception(e)
-        return migrated, duplicates, errors + 1
+        return migrated, duplicates, stats['errors'] + 1
+    finally:
+        db.set_bulk_mode(False)
+        db.disconnect()
 
 
 def verify_migration():
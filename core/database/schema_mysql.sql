@@ -19,7 +19,8 @@ CREATE TABLE IF NOT EXISTS generated_codes (
     exported_to_excel TINYINT(1) DEFAULT 0,
     excel_export_path VARCHAR(500),
     notes TEXT,
-    INDEX idx_code (code),
+    -- UNIQUE(code) ya crea el índice usado por code_exists
+    INDEX idx_meter_serial (meter_serial),
     INDEX idx_created (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -37,7 +38,8 @@ CREATE TABLE IF NOT EXISTS qr_operations (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_type (operation_type),
     INDEX idx_status (status),
-    INDEX idx_created (created_at)
+    -- Compuesto: los conteos por día (y por tipo) se resuelven solo con el índice
+    INDEX idx_created_type (created_at, operation_type)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Tabla de Auditorías de Archivos
@@ -93,19 +95,30 @@ CREATE TABLE IF NOT EXISTS file_searches (
 
 -- Tabla de Logs del Sistema
 -- Almacena logs importantes del sistema
+-- Particionada por mes (created_at): las consultas recientes leen solo las
+-- últimas particiones y la depuración usa DROP PARTITION en vez de DELETE.
+-- Database.ensure_log_partitions() crea las particiones mensuales y
+-- Database._upgrade_schema() convierte las tablas creadas sin particiones.
 CREATE TABLE IF NOT EXISTS system_logs (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT AUTO_INCREMENT,
     module_name VARCHAR(50) NOT NULL,
     action VARCHAR(100) NOT NULL,
     level VARCHAR(10) NOT NULL,  -- 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'
     message TEXT NOT NULL,
     traceback TEXT,
     extra_data TEXT,  -- JSON string con datos adicionales
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- La clave de partición debe formar parte de la PK
+    PRIMARY KEY (id, created_at),
     INDEX idx_level (level),
     INDEX idx_module (module_name),
-    INDEX idx_created (created_at)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    -- Compuesto: sirve a v_recent_logs (ORDER BY created_at) y a filtros por nivel
+    INDEX idx_created_level (created_at, level)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (
+    PARTITION p_init VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')),
+    PARTITION p_max VALUES LESS THAN MAXVALUE
+);
 
 -- Tabla de URLs de Dropbox
 -- Almacena URLs compartidas de archivos en Dropbox
@@ -124,18 +137,42 @@ CREATE TABLE IF NOT EXISTS dropbox_urls (
     INDEX idx_file_path (file_path(255))
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Versión del esquema aplicada (la registra Database._initialize_database
+-- cuando el script y las actualizaciones terminaron sin errores)
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- ===================================
 -- VISTAS
 -- ===================================
 
 -- Vista para estadísticas generales
+-- Los filtros "de hoy" son rangos sobre created_at para usar idx_created
 CREATE OR REPLACE VIEW v_dashboard_stats AS
 SELECT
     (SELECT COUNT(*) FROM generated_codes) as total_codes_generated,
-    (SELECT COUNT(*) FROM qr_operations WHERE DATE(created_at) = CURDATE()) as qr_operations_today,
-    (SELECT COUNT(*) FROM file_audits WHERE DATE(created_at) = CURDATE()) as audits_today,
+    (SELECT COUNT(*) FROM qr_operations WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY) as qr_operations_today,
+    (SELECT COUNT(*) FROM file_audits WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY) as audits_today,
     (SELECT COALESCE(SUM(space_saved_mb), 0) FROM pdf_compressions) as total_space_saved_mb,
-    (SELECT COUNT(*) FROM file_searches WHERE DATE(created_at) = CURDATE()) as searches_today;
+    (SELECT COUNT(*) FROM file_searches WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY) as searches_today;
+
+-- Estadísticas del dashboard precalculadas (una sola fila)
+-- La vista anterior recorre cinco tablas; el dashboard lee esta fila por PK
+CREATE TABLE IF NOT EXISTS mv_dashboard_stats (
+    snapshot_id TINYINT PRIMARY KEY DEFAULT 1,
+    total_codes_generated BIGINT NOT NULL DEFAULT 0,
+    qr_operations_today INT NOT NULL DEFAULT 0,
+    audits_today INT NOT NULL DEFAULT 0,
+    total_space_saved_mb DECIMAL(15,2) NOT NULL DEFAULT 0,
+    searches_today INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- El procedimiento sp_refresh_dashboard_stats (recalcula esta fila) lo crea
+-- Database._ensure_dashboard_procedure() aparte: necesita CREATE ROUTINE y
+-- su falta no debe cortar el resto del script.
 
 -- Vista para logs recientes
 CREATE OR REPLACE VIEW v_recent_logs AS
@@ -158,3 +195,7 @@ LIMIT 100;
 INSERT INTO system_logs (module_name, action, level, message)
 VALUES ('database', 'schema_initialization', 'INFO', 'Base de datos MySQL inicializada correctamente')
 ON DUPLICATE KEY UPDATE module_name=module_name;
+
+-- El evento ev_refresh_dashboard (refresco periódico de mv_dashboard_stats)
+-- es opcional y lo crea Database._ensure_dashboard_event(): necesita el
+-- privilegio EVENT y su falta no debe impedir aplicar el resto del esquema.
@@ -8,14 +8,16 @@ Proporciona métodos CRUD básicos y manejo de conexiones.
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
+from itertools import islice
 import json
 import threading
+from contextlib import contextmanager
 
 try:
     import mysql.connector
-    from mysql.connector import Error
+    from mysql.connector import Error, errorcode
 except ImportError as e:
     # Fallback or re-raise
     raise e
@@ -26,12 +28,62 @@ from config.settings import Settings
 class Database:
     """Clase para gestión de base de datos MySQL."""
     
-    def __init__(self, db_config: Optional[Dict[str, Any]] = None):
+    # Sentencia de inserción de códigos (se construye una sola vez)
+    _INSERT_GENERATED_CODE_SQL = (
+        "INSERT INTO generated_codes (code, article_name, meter_serial, service_type, "
+        "exported_to_excel, excel_export_path, notes) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+    )
+    
+    # Versión del esquema que esta aplicación espera encontrar en schema_version.
+    # Se registra al final de _initialize_database, solo si todo se aplicó.
+    SCHEMA_VERSION = 1
+    
+    # Niveles de aislamiento válidos para SET SESSION TRANSACTION ISOLATION LEVEL
+    _ISOLATION_LEVELS = frozenset((
+        'READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ', 'SERIALIZABLE'
+    ))
+    
+    # Meses futuros con partición de system_logs ya creada
+    LOG_PARTITIONS_AHEAD = 1
+    
+    # Particionado inicial de system_logs (igual que en schema_mysql.sql);
+    # ensure_log_partitions divide luego p_max en particiones mensuales
+    _LOG_PARTITION_CLAUSE = (
+        "PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) ("
+        "PARTITION p_init VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')), "
+        "PARTITION p_max VALUES LESS THAN MAXVALUE)"
+    )
+    
+    # Antigüedad máxima (segundos) de mv_dashboard_stats antes de recalcular
+    DASHBOARD_STATS_MAX_AGE = 60
+    
+    _DASHBOARD_STATS_SQL = (
+        "SELECT total_codes_generated, qr_operations_today, audits_today, "
+        "total_space_saved_mb, searches_today, "
+        "refreshed_at < NOW() - INTERVAL %s SECOND AS stale "
+        "FROM mv_dashboard_stats WHERE snapshot_id = 1"
+    )
+    
+    # Recalcula la fila de mv_dashboard_stats a partir de v_dashboard_stats
+    _DASHBOARD_PROCEDURE_SQL = (
+        "CREATE PROCEDURE sp_refresh_dashboard_stats() "
+        "REPLACE INTO mv_dashboard_stats "
+        "(snapshot_id, total_codes_generated, qr_operations_today, audits_today, "
+        "total_space_saved_mb, searches_today, refreshed_at) "
+        "SELECT 1, total_codes_generated, qr_operations_today, audits_today, "
+        "total_space_saved_mb, searches_today, NOW() "
+        "FROM v_dashboard_stats"
+    )
+    
+    def __init__(self, db_config: Optional[Dict[str, Any]] = None, initialize: bool = True):
         """
         Inicializa la conexión a la base de datos MySQL.
         
         Args:
             db_config: Diccionario con configuración de MySQL. Si es None, usa Settings
+            initialize: Si False, no verifica ni aplica el esquema (conexiones
+                secundarias, como la del hilo de logs, cuando la principal ya lo hizo)
         """
         if db_config is None:
             self.db_config = {
@@ -42,19 +94,33 @@ class Database:
                 'password': Settings.DB_PASSWORD,
                 'charset': Settings.DB_CHARSET,
                 'collation': 'utf8mb4_unicode_ci',
-                'autocommit': False
+                'use_unicode': True,
+                'autocommit': False,
+                # Extensión C del conector y sin consultar advertencias
+                # (SHOW WARNINGS) tras cada sentencia
+                'use_pure': False,
+                'get_warnings': False,
+                'raise_on_warnings': False,
+                # Pool compartido: reconectar reutiliza conexiones ya
+                # autenticadas en vez de repetir el handshake
+                'pool_name': 'sgdi',
+                'pool_size': Settings.DB_POOL_SIZE
             }
         else:
             self.db_config = db_config
             
         self.connection = None
         self.cursor = None
+        self._insert_code_stmt = None
+        self._session_defaults = None
+        self._transaction_depth = 0
         
         # Asegurar que el directorio de datos existe
         Settings.ensure_directories()
         
         # Inicializar base de datos si no existe
-        self._initialize_database()
+        if initialize:
+            self._initialize_database()
     
     
     def connect(self):
@@ -63,12 +129,16 @@ class Database:
             try:
                 self.connection = mysql.connector.connect(**self.db_config)
                 self.cursor = self.connection.cursor(dictionary=True)
+                self._insert_code_stmt = None
             except Error as e:
                 print(f"❌ Error al conectar con MySQL: {e}")
                 raise
     
     def disconnect(self):
-        """Cierra la conexión con la base de datos."""
+        """Cierra la conexión (si viene del pool, la devuelve al pool)."""
+        if self._insert_code_stmt:
+            self._insert_code_stmt.close()
+            self._insert_code_stmt = None
         if self.cursor:
             self.cursor.close()
             self.cursor = None
@@ -81,15 +151,12 @@ class Database:
         try:
             self.connect()
             
-            # Verificar si las tablas ya existen para evitar re-ejecutar el schema
-            self.cursor.execute(
-                "SELECT COUNT(*) as cnt FROM information_schema.tables "
-                "WHERE table_schema = %s AND table_name = 'system_logs'",
-                (self.db_config['database'],)
-            )
-            result = self.cursor.fetchone()
-            if result and result['cnt'] > 0:
+            # Verificar la versión registrada para evitar re-ejecutar el schema.
+            # Si una ejecución anterior falló a medias no hay versión y se
+            # vuelve a aplicar (el script es idempotente).
+            if self._schema_version() >= self.SCHEMA_VERSION:
                 print(f"✓ Base de datos MySQL ya inicializada")
+                self.ensure_log_partitions()
                 return
             
         except Error as e:
@@ -107,21 +174,357 @@ class Database:
             with open(schema_path, 'r', encoding='utf-8') as f:
                 schema_sql = f.read()
             
-            # Ejecutar cada statement por separado
-            statements = schema_sql.split(';')
-            for statement in statements:
-                statement = statement.strip()
-                if statement and not statement.startswith('--'):
-                    try:
-                        self.cursor.execute(statement)
-                    except Error as e:
-                        if "already exists" not in str(e).lower():
-                            pass
+            # Enviar el script completo en una sola ida y vuelta; el servidor
+            # ejecuta las sentencias seguidas y hay que consumir cada resultado
+            for _ in self.cursor.execute(schema_sql, multi=True):
+                pass
             
             self.connection.commit()
+            
+            # Tablas ya existentes (BD creadas con un esquema anterior)
+            self._upgrade_schema()
+            
+            self.cursor.execute(
+                "INSERT INTO schema_version (version) VALUES (%s) "
+                "ON DUPLICATE KEY UPDATE applied_at = CURRENT_TIMESTAMP",
+                (self.SCHEMA_VERSION,)
+            )
+            self.connection.commit()
             print(f"✓ Base de datos MySQL inicializada correctamente")
         except Error as e:
+            # Sin versión registrada: se reintenta en el próximo inicio
             print(f"⚠️ Advertencia al inicializar BD: {e}")
+            return
+        
+        if self._ensure_dashboard_procedure():
+            self._ensure_dashboard_event()
+        self.ensure_log_partitions()
+    
+    def _schema_version(self) -> int:
+        """Retorna la versión de esquema registrada (0 si no hay tabla o filas)."""
+        try:
+            self.cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+        except Error as e:
+            if e.errno == errorcode.ER_NO_SUCH_TABLE:
+                return 0
+            raise
+        result = self.cursor.fetchone()
+        return (result and result['version']) or 0
+    
+    def _index_exists(self, table: str, index: str) -> bool:
+        """Indica si la tabla tiene un índice con ese nombre."""
+        self.cursor.execute(
+            "SELECT 1 AS found FROM information_schema.statistics "
+            "WHERE table_schema = %s AND table_name = %s AND index_name = %s LIMIT 1",
+            (self.db_config['database'], table, index)
+        )
+        return self.cursor.fetchone() is not None
+    
+    def _sync_indexes(self, table: str, add: Dict[str, str], drop: Tuple[str, ...] = ()):
+        """
+        Agrega y elimina índices de una tabla en un único ALTER TABLE.
+        
+        Solo incluye los cambios que faltan, por lo que es idempotente.
+        
+        Args:
+            table: Tabla a modificar
+            add: {nombre del índice: columnas, p. ej. '(created_at, level)'}
+            drop: Índices a eliminar si existen
+        """
+        clauses = [
+            f"ADD INDEX {name} {columns}"
+            for name, columns in add.items() if not self._index_exists(table, name)
+        ]
+        clauses += [f"DROP INDEX {name}" for name in drop if self._index_exists(table, name)]
+        if clauses:
+            self.cursor.execute(f"ALTER TABLE {table} {', '.join(clauses)}")
+            print(f"✓ Índices actualizados en {table}")
+    
+    def _upgrade_schema(self):
+        """
+        Lleva las tablas existentes a la definición actual de schema_mysql.sql.
+        
+        CREATE TABLE IF NOT EXISTS no modifica tablas ya creadas, así que las
+        BD instaladas con un esquema anterior reciben aquí los índices nuevos.
+        Cada paso consulta information_schema antes de alterar la tabla.
+        """
+        self._sync_indexes('generated_codes', {'idx_meter_serial': '(meter_serial)'},
+                           drop=('idx_code',))
+        self._sync_indexes('qr_operations', {'idx_created_type': '(created_at, operation_type)'},
+                           drop=('idx_created',))
+        self._sync_indexes('system_logs', {'idx_created_level': '(created_at, level)'},
+                           drop=('idx_created',))
+        if not self._is_partitioned('system_logs'):
+            self._partition_system_logs()
+    
+    def _is_partitioned(self, table: str) -> bool:
+        """Indica si la tabla está particionada."""
+        self.cursor.execute(
+            "SELECT 1 AS found FROM information_schema.partitions "
+            "WHERE table_schema = %s AND table_name = %s "
+            "AND partition_name IS NOT NULL LIMIT 1",
+            (self.db_config['database'], table)
+        )
+        return self.cursor.fetchone() is not None
+    
+    def _partition_system_logs(self):
+        """
+        Convierte un system_logs sin particionar al particionado mensual.
+        
+        La clave de partición debe formar parte de la PK, por lo que primero
+        se pasa la PK a (id, created_at) con created_at NOT NULL. Reescribe
+        la tabla completa: solo se ejecuta una vez, durante la actualización.
+        """
+        print("⏳ Particionando system_logs (una sola vez)...")
+        self.cursor.execute(
+            "UPDATE system_logs SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"
+        )
+        self.connection.commit()
+        self.cursor.execute(
+            "ALTER TABLE system_logs "
+            "MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+            "DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)"
+        )
+        self.cursor.execute(f"ALTER TABLE system_logs {self._LOG_PARTITION_CLAUSE}")
+        print("✓ system_logs particionada")
+    
+    def _ensure_dashboard_procedure(self) -> bool:
+        """
+        Crea (o reemplaza) sp_refresh_dashboard_stats (opcional).
+        
+        Requiere el privilegio CREATE ROUTINE y, con binlog activo,
+        log_bin_trust_function_creators; si falla, get_dashboard_stats
+        consulta directamente v_dashboard_stats.
+        
+        Returns:
+            True si el procedimiento quedó creado
+        """
+        try:
+            self.cursor.execute("DROP PROCEDURE IF EXISTS sp_refresh_dashboard_stats")
+            self.cursor.execute(self._DASHBOARD_PROCEDURE_SQL)
+            return True
+        except Error as e:
+            print(f"⚠️ Procedimiento de estadísticas del dashboard no creado: {e}")
+            return False
+    
+    def _ensure_dashboard_event(self):
+        """
+        Crea el evento que refresca mv_dashboard_stats cada minuto (opcional).
+        
+        Requiere el privilegio EVENT y event_scheduler=ON; si no se puede
+        crear, get_dashboard_stats refresca la fila al leerla vencida.
+        """
+        try:
+            self.cursor.execute(
+                "CREATE EVENT IF NOT EXISTS ev_refresh_dashboard "
+                "ON SCHEDULE EVERY 1 MINUTE "
+                "DO CALL sp_refresh_dashboard_stats()"
+            )
+        except Error as e:
+            print(f"⚠️ Evento de refresco del dashboard no creado: {e}")
+    
+    def _log_partitions(self) -> Dict[str, int]:
+        """Retorna {nombre: límite superior (epoch)} de las particiones mensuales de system_logs."""
+        rows = self.fetch_all(
+            "SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS bound "
+            "FROM information_schema.partitions "
+            "WHERE table_schema = %s AND table_name = 'system_logs' "
+            "AND partition_name IS NOT NULL",
+            (self.db_config['database'],)
+        )
+        if not rows:
+            print("⚠️ system_logs no está particionada: las particiones mensuales "
+                  "se omiten hasta que se actualice el esquema")
+        return {
+            row['name']: int(row['bound'])
+            for row in rows if row['bound'] != 'MAXVALUE'
+        }
+    
+    def ensure_log_partitions(self, months_ahead: int = LOG_PARTITIONS_AHEAD) -> int:
+        """
+        Crea las particiones mensuales de system_logs que falten.
+        
+        Divide p_max para que existan particiones hasta `months_ahead` meses
+        después del actual. Si la tabla no está particionada (la actualización
+        del esquema no pudo aplicarse) solo emite una advertencia.
+        
+        Args:
+            months_ahead: Meses futuros a preparar
+            
+        Returns:
+            Número de particiones creadas
+        """
+        created = 0
+        try:
+            partitions = self._log_partitions()
+            if not partitions:
+                return 0
+            
+            today = datetime.now()
+            year, month = today.year, today.month
+            for _ in range(months_ahead + 1):
+                next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+                name = f"p{year:04d}{month:02d}"
+                bound = f"{next_year:04d}-{next_month:02d}-01 00:00:00"
+                
+                if name not in partitions:
+                    self.execute("SELECT UNIX_TIMESTAMP(%s) AS bound", (bound,))
+                    bound_ts = int(self.cursor.fetchone()['bound'])
+                    if bound_ts > max(partitions.values()):
+                        self.execute(
+                            "ALTER TABLE system_logs REORGANIZE PARTITION p_max INTO ("
+                            f"PARTITION {name} VALUES LESS THAN ({bound_ts}), "
+                            "PARTITION p_max VALUES LESS THAN MAXVALUE)"
+                        )
+                        partitions[name] = bound_ts
+                        created += 1
+                
+                year, month = next_year, next_month
+        except Error as e:
+            print(f"⚠️ No se pudieron preparar particiones de logs: {e}")
+        
+        return created
+    
+    def drop_log_partitions_before(self, cutoff: datetime) -> int:
+        """
+        Elimina los logs anteriores a una fecha borrando particiones completas.
+        
+        Solo se eliminan particiones cuyo límite superior es <= cutoff, por lo
+        que ningún log posterior a la fecha se pierde.
+        
+        Args:
+            cutoff: Fecha límite
+            
+        Returns:
+            Número de particiones eliminadas
+        """
+        partitions = self._log_partitions()
+        if not partitions:
+            return 0
+        
+        self.execute("SELECT UNIX_TIMESTAMP(%s) AS cutoff", (cutoff,))
+        cutoff_ts = int(self.cursor.fetchone()['cutoff'])
+        
+        names = [name for name, bound in partitions.items() if bound <= cutoff_ts]
+        if names:
+            self.execute(f"ALTER TABLE system_logs DROP PARTITION {', '.join(names)}")
+        return len(names)
+    
+    def begin(self):
+        """Inicia una transacción explícita (si no hay una en curso)."""
+        self.connect()
+        if not self.connection.in_transaction:
+            self.connection.start_transaction()
+    
+    def commit(self):
+        """Confirma la transacción en curso."""
+        if self.connection:
+            self.connection.commit()
+    
+    def rollback(self):
+        """Revierte la transacción en curso."""
+        if self.connection:
+            self.connection.rollback()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa varias operaciones en una sola transacción.
+        
+        Dentro del bloque, insert/update/delete/execute_many no confirman por
+        sí mismos: se hace un único commit al salir, o rollback si hay error.
+        Los bloques anidados se integran en la transacción externa.
+        
+        Example:
+            >>> with db.transaction():
+            ...     for code in codes:
+            ...         db.save_generated_code(code)
+        """
+        outermost = self._transaction_depth == 0
+        if outermost:
+            self.begin()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            if outermost:
+                self.rollback()
+            raise
+        else:
+            if outermost:
+                self.commit()
+        finally:
+            self._transaction_depth -= 1
+    
+    @contextmanager
+    def read_committed(self):
+        """
+        Ejecuta lecturas en una transacción propia con READ COMMITTED.
+        
+        Las lecturas ven lo confirmado por otras sesiones (no una instantánea
+        vieja de la conexión compartida) y no toman gap locks. Solo afecta a
+        esa transacción: las escrituras conservan el aislamiento de la sesión.
+        Dentro de transaction() se lee con la transacción en curso. No usar
+        entre begin() y commit() manuales: se confirma lo pendiente.
+        
+        Example:
+            >>> with db.read_committed():
+            ...     stats = db.fetch_one("SELECT COUNT(*) AS n FROM qr_operations")
+        """
+        if self._transaction_depth:
+            yield self
+            return
+        
+        self.connect()
+        # Cerrar la transacción implícita de lecturas anteriores: el nivel de
+        # aislamiento solo puede cambiarse antes de iniciar una transacción
+        self.connection.commit()
+        self.cursor.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+        try:
+            yield self
+        finally:
+            self.connection.commit()
+    
+    def _commit_unless_in_transaction(self):
+        """Confirma la operación salvo que haya una transacción externa abierta."""
+        if not self._transaction_depth:
+            self.connection.commit()
+    
+    def set_bulk_mode(self, enable: bool):
+        """
+        Ajusta la sesión MySQL para cargas masivas.
+        
+        Con enable=True usa READ COMMITTED para que los INSERT por lotes no
+        tomen gap locks; con enable=False restaura el nivel de aislamiento
+        previo. Usar en una instancia Database() dedicada a la carga, no en
+        la compartida de get_db().
+        
+        Args:
+            enable: True para activar el modo masivo, False para restaurar
+        """
+        self.connect()
+        if enable:
+            self._session_defaults = {'isolation': self._session_isolation()}
+            self.cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+        elif self._session_defaults:
+            # 'REPEATABLE-READ' -> REPEATABLE READ (valor de la variable -> sintaxis SET)
+            level = self._session_defaults['isolation'].replace('-', ' ')
+            if level in self._ISOLATION_LEVELS:
+                self.cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {level}")
+            self._session_defaults = None
+        # Cerrar la transacción implícita para que el cambio aplique a la siguiente
+        self.connection.commit()
+    
+    def _session_isolation(self) -> str:
+        """Nivel de aislamiento de la sesión (MySQL 8 y MariaDB < 11.1 usan variables distintas)."""
+        for variable in ('transaction_isolation', 'tx_isolation'):
+            try:
+                self.cursor.execute(f"SELECT @@SESSION.{variable} AS isolation")
+                return self.cursor.fetchone()['isolation']
+            except Error as e:
+                if e.errno != errorcode.ER_UNKNOWN_SYSTEM_VARIABLE:
+                    raise
+        return 'REPEATABLE-READ'
     
     def execute(self, query: str, params: Tuple = ()):
         """
@@ -150,9 +553,44 @@ class Database:
         """
         self.connect()
         self.cursor.executemany(query, params_list)
-        self.connection.commit()
+        self._commit_unless_in_transaction()
         return self.cursor.rowcount
     
+    def bulk_insert(self, table: str, columns: List[str], rows: Iterable[Tuple],
+                    chunk_size: int = 5000, ignore: bool = False) -> int:
+        """
+        Inserta filas por lotes en una sola transacción.
+        
+        La sentencia se construye una sola vez y se ejecuta con executemany
+        por bloques de `chunk_size` filas, sin commits intermedios.
+        
+        Args:
+            table: Nombre de la tabla
+            columns: Columnas a insertar, en el orden de cada tupla
+            rows: Iterable (puede ser un generador) de tuplas con los valores
+            chunk_size: Cantidad de filas por executemany
+            ignore: Si True usa INSERT IGNORE (omite duplicados)
+            
+        Returns:
+            Número de filas insertadas
+        """
+        verb = "INSERT IGNORE" if ignore else "INSERT"
+        placeholders = ', '.join(['%s'] * len(columns))
+        query = f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        
+        rows = iter(rows)
+        inserted = 0
+        
+        with self.transaction():
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                self.cursor.executemany(query, chunk)
+                inserted += self.cursor.rowcount
+        
+        return inserted
+    
     def fetch_one(self, query: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
         """
         Obtiene un solo registro.
@@ -165,8 +603,7 @@ class Database:
             Diccionario con el registro o None
         """
         self.execute(query, params)
-        row = self.cursor.fetchone()
-        return dict(row) if row else None
+        return self.cursor.fetchone()
     
     def fetch_all(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -180,8 +617,21 @@ class Database:
             Lista de diccionarios con los registros
         """
         self.execute(query, params)
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return self.cursor.fetchall()
+    
+    def iter_rows(self, query: str, params: Tuple = ()) -> Iterator[Dict[str, Any]]:
+        """
+        Itera los registros directamente desde el cursor, sin materializarlos.
+        
+        Args:
+            query: Consulta SQL
+            params: Parámetros de la consulta
+            
+        Yields:
+            Cada registro como diccionario
+        """
+        self.execute(query, params)
+        yield from self.cursor
     
     def insert(self, table: str, data: Dict[str, Any]) -> int:
         """
@@ -199,7 +649,7 @@ class Database:
         query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
         
         self.execute(query, tuple(data.values()))
-        self.connection.commit()
+        self._commit_unless_in_transaction()
         return self.cursor.lastrowid
     
     def update(self, table: str, data: Dict[str, Any], where: str, where_params: Tuple = ()) -> int:
@@ -220,7 +670,7 @@ class Database:
         
         params = tuple(data.values()) + where_params
         self.execute(query, params)
-        self.connection.commit()
+        self._commit_unless_in_transaction()
         return self.cursor.rowcount
     
     def delete(self, table: str, where: str, where_params: Tuple = ()) -> int:
@@ -237,7 +687,7 @@ class Database:
         """
         query = f"DELETE FROM {table} WHERE {where}"
         self.execute(query, where_params)
-        self.connection.commit()
+        self._commit_unless_in_transaction()
         return self.cursor.rowcount
     
     # ===================================
@@ -267,33 +717,143 @@ class Database:
         }
         return self.insert('system_logs', data)
     
+    def log_many_to_database(self, entries: Iterable[Tuple]) -> int:
+        """
+        Registra varios logs en la base de datos en una sola transacción.
+        
+        Args:
+            entries: Tuplas (module, action, level, message, traceback, extra_data)
+            
+        Returns:
+            Número de logs insertados
+        """
+        rows = (
+            (module, action, level, message, traceback,
+             json.dumps(extra_data) if extra_data else None)
+            for module, action, level, message, traceback, extra_data in entries
+        )
+        return self.bulk_insert(
+            'system_logs',
+            ['module_name', 'action', 'level', 'message', 'traceback', 'extra_data'],
+            rows
+        )
+    
+    def _insert_code_cursor(self):
+        """Cursor preparado en el servidor para el INSERT de códigos (uno por conexión)."""
+        self.connect()
+        if self._insert_code_stmt is None:
+            self._insert_code_stmt = self.connection.cursor(prepared=True)
+        return self._insert_code_stmt
+    
     def save_generated_code(self, code: str, article_name: str = "", 
                            meter_serial: str = "", service_type: str = "",
                            excel_path: str = None, notes: str = None) -> int:
         """Guarda un código generado con columnas separadas."""
-        data = {
-            'code': code,
-            'article_name': article_name,
-            'meter_serial': meter_serial,
-            'service_type': service_type,
-            'exported_to_excel': 1 if excel_path else 0,
-            'excel_export_path': excel_path,
-            'notes': notes
-        }
-        return self.insert('generated_codes', data)
+        # La sentencia se prepara en la primera llamada y luego solo se
+        # envían los parámetros
+        cursor = self._insert_code_cursor()
+        cursor.execute(
+            self._INSERT_GENERATED_CODE_SQL,
+            (code, article_name, meter_serial, service_type,
+             1 if excel_path else 0, excel_path, notes)
+        )
+        self._commit_unless_in_transaction()
+        return cursor.lastrowid
+    
+    def upsert_generated_code(self, code: str, article_name: str = "",
+                              meter_serial: str = "", service_type: str = "",
+                              excel_path: str = None, notes: str = None) -> int:
+        """
+        Guarda un código o, si ya existe, actualiza su artículo, número de
+        serie y tipo de servicio.
+        
+        Un solo INSERT ... ON DUPLICATE KEY UPDATE sobre UNIQUE(code): sin
+        consulta previa a code_exists ni carrera entre consulta e inserción.
+        La ruta del Excel y las notas del registro existente se conservan.
+        
+        Args:
+            code: Código a guardar
+            article_name: Nombre del artículo
+            meter_serial: Número de serie del medidor
+            service_type: Tipo de servicio
+            excel_path: Ruta del Excel exportado (opcional)
+            notes: Notas adicionales
+            
+        Returns:
+            ID del registro insertado o del actualizado
+        """
+        # LAST_INSERT_ID(id) hace que el id existente llegue en el paquete OK
+        self.execute(
+            self._INSERT_GENERATED_CODE_SQL + " ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), "
+            "article_name = VALUES(article_name), meter_serial = VALUES(meter_serial), "
+            "service_type = VALUES(service_type)",
+            (code, article_name, meter_serial, service_type,
+             1 if excel_path else 0, excel_path, notes)
+        )
+        self._commit_unless_in_transaction()
+        return self.cursor.lastrowid
+    
+    def save_generated_codes_bulk(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        """
+        Guarda varios códigos generados con un único INSERT multi-fila.
+        
+        Los códigos que ya existen se omiten (INSERT IGNORE sobre UNIQUE(code)).
+        
+        Args:
+            rows: Tuplas (code, article_name, notes)
+            
+        Returns:
+            Número de códigos insertados
+        """
+        return self.bulk_insert(
+            'generated_codes', ['code', 'article_name', 'notes'], rows, ignore=True
+        )
+    
+    def existing_codes(self, codes: Iterable[str], for_update: bool = False) -> set:
+        """
+        Retorna cuáles de los códigos ya existen en generated_codes.
+        
+        Args:
+            codes: Códigos a consultar
+            for_update: Si True (dentro de transaction()) bloquea esas claves de
+                UNIQUE(code) hasta el commit, para que otra sesión no las
+                inserte entre esta consulta y el INSERT
+            
+        Returns:
+            Conjunto de códigos existentes
+        """
+        codes = tuple(codes)
+        if not codes:
+            return set()
+        placeholders = ', '.join(['%s'] * len(codes))
+        query = f"SELECT code FROM generated_codes WHERE code IN ({placeholders})"
+        if for_update:
+            query += " FOR UPDATE"
+        return {row['code'] for row in self.fetch_all(query, codes)}
     
     def code_exists(self, code: str) -> bool:
         """Verifica si un código ya existe."""
         result = self.fetch_one(
-            "SELECT COUNT(*) as count FROM generated_codes WHERE code = %s",
+            "SELECT 1 AS found FROM generated_codes WHERE code = %s LIMIT 1",
             (code,)
         )
-        return result['count'] > 0 if result else False
+        return result is not None
     
     def get_all_codes(self) -> set:
         """Obtiene todos los códigos generados."""
-        rows = self.fetch_all("SELECT code FROM generated_codes")
-        return {row['code'] for row in rows}
+        self.connect()
+        # Cursor de tuplas: evita construir un dict por cada fila
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT code FROM generated_codes")
+            return {row[0] for row in cursor}
+        finally:
+            cursor.close()
+    
+    def count_codes(self) -> int:
+        """Cuenta los códigos generados sin traerlos a memoria."""
+        result = self.fetch_one("SELECT COUNT(*) AS total FROM generated_codes")
+        return result['total'] if result else 0
     
     def save_qr_operation(self, operation_type: str, status: str, 
                          file_path: str = None, qr_content: str = None,
@@ -363,8 +923,32 @@ class Database:
         return self.insert('file_searches', data)
     
     def get_dashboard_stats(self) -> Dict[str, Any]:
-        """Obtiene estadísticas para el dashboard."""
-        return self.fetch_one("SELECT * FROM v_dashboard_stats") or {}
+        """
+        Obtiene estadísticas para el dashboard.
+        
+        Lee la fila precalculada de mv_dashboard_stats y solo la recalcula
+        si falta o tiene más de DASHBOARD_STATS_MAX_AGE segundos. Si la tabla
+        o el procedimiento no existen (esquema a medio aplicar o sin
+        privilegio CREATE ROUTINE), consulta directamente v_dashboard_stats.
+        
+        Returns:
+            Diccionario con las estadísticas
+        """
+        with self.read_committed():
+            try:
+                stats = self.fetch_one(self._DASHBOARD_STATS_SQL, (self.DASHBOARD_STATS_MAX_AGE,))
+                if stats is None or stats['stale']:
+                    self.execute("CALL sp_refresh_dashboard_stats()")
+                    self._commit_unless_in_transaction()
+                    stats = self.fetch_one(self._DASHBOARD_STATS_SQL, (self.DASHBOARD_STATS_MAX_AGE,))
+            except Error as e:
+                print(f"⚠️ Estadísticas precalculadas no disponibles, usando la vista: {e}")
+                return self.fetch_one("SELECT * FROM v_dashboard_stats") or {}
+        
+        if not stats:
+            return {}
+        stats.pop('stale')
+        return stats
     
     def save_dropbox_url(self, file_path: str, file_name: str, folder_type: str,
                         shared_url: str, file_size: int = None, modified_date: str = None,
@@ -489,10 +1073,28 @@ class Database:
     def get_recent_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
 
         """Obtiene los logs más recientes."""
-        return self.fetch_all(
-            f"SELECT * FROM v_recent_logs LIMIT %s",
-            (limit,)
-        )
+        with self.read_committed():
+            return self.fetch_all(
+                f"SELECT * FROM v_recent_logs LIMIT %s",
+                (limit,)
+            )
+    
+    def count_recent_logs(self, limit: int = 100) -> int:
+        """
+        Cuenta los logs recientes sin traer las filas (máximo `limit`).
+        
+        Args:
+            limit: Tope del conteo (igual que get_recent_logs)
+            
+        Returns:
+            Cantidad de logs, como mucho `limit`
+        """
+        with self.read_committed():
+            result = self.fetch_one(
+                "SELECT COUNT(*) AS total FROM (SELECT 1 FROM system_logs LIMIT %s) AS t",
+                (limit,)
+            )
+        return result['total'] if result else 0
     
     def __enter__(self):
         """Context manager: entrada."""
@@ -510,10 +1112,13 @@ class Database:
 
 # Instancia global para uso compartido
 _db_instance = None
+_db_lock = threading.Lock()
 
 def get_db() -> Database:
-    """Obtiene la instancia global de la base de datos."""
+    """Obtiene la instancia global de la base de datos (thread-safe)."""
     global _db_instance
     if _db_instance is None:
-        _db_instance = Database()
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = Database()
     return _db_instance
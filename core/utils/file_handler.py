@@ -7,14 +7,29 @@ Utilidades para operaciones comunes con archivos y directorios.
 
 import os
 import shutil
+import sys
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Optional, Callable, Tuple
+from typing import Iterator, List, Optional, Callable, Tuple
 import hashlib
+from functools import lru_cache, partial
 
 from core.utils.logger import get_logger
 
 log = get_logger(__name__)
 
+# Hilos para recorrer árboles de directorios en find_files
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Pool compartido por todas las búsquedas (se crea en el primer uso)
+_scan_pool: Optional[ThreadPoolExecutor] = None
+_scan_pool_lock = threading.Lock()
+
+# Tamaño del buffer de lectura para calcular hashes (1 MiB)
+HASH_BUFFER_SIZE = 1 << 20
+
 
 def ensure_directory(path: str | Path) -> Path:
     """
@@ -31,13 +46,16 @@ def ensure_directory(path: str | Path) -> Path:
     return path
 
 
-def safe_file_operation(operation: Callable, *args, **kwargs) -> Tuple[bool, Optional[str]]:
+def safe_file_operation(operation: Callable, *args, quiet: bool = False,
+                        **kwargs) -> Tuple[bool, Optional[str]]:
     """
     Ejecuta una operación de archivo de forma segura.
     
     Args:
         operation: Función a ejecutar
         *args: Argumentos posicionales
+        quiet: Si True, los fallos se registran en DEBUG y sin traceback
+            (para operaciones masivas donde fallar es esperable)
         **kwargs: Argumentos con nombre
         
     Returns:
@@ -48,16 +66,85 @@ def safe_file_operation(operation: Callable, *args, **kwargs) -> Tuple[bool, Opt
         return True, None
     except PermissionError as e:
         error_msg = f"Permiso denegado: {e}"
-        log.error(error_msg)
-        return False, error_msg
     except FileNotFoundError as e:
         error_msg = f"Archivo no encontrado: {e}"
-        log.error(error_msg)
-        return False, error_msg
     except Exception as e:
         error_msg = f"Error inesperado: {e}"
-        log.exception(e)
+        if quiet:
+            log.debug(error_msg)
+        else:
+            log.exception(e)
         return False, error_msg
+    
+    if quiet:
+        log.debug(error_msg)
+    else:
+        log.error(error_msg)
+    return False, error_msg
+
+
+def _load_copy_file2() -> Optional[Callable]:
+    """Carga CopyFile2 de kernel32 (Windows 8+); None en otros sistemas."""
+    if sys.platform != 'win32':
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+        
+        func = ctypes.windll.kernel32.CopyFile2
+        func.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p)
+        func.restype = ctypes.HRESULT  # Lanza OSError si falla
+        return func
+    except (ImportError, AttributeError, OSError):
+        return None
+
+
+_COPY_FILE2 = _load_copy_file2()
+
+
+def _fast_copy(source: str | Path, destination: str | Path) -> str:
+    """
+    Copia el contenido de un archivo por la vía más rápida del sistema.
+    
+    - Windows: CopyFile2 (copia en el kernel, offload SMB y CoW en ReFS)
+    - Resto: shutil.copyfile (ya usa sendfile/copy_file_range en Linux)
+    
+    Args:
+        source: Ruta del archivo fuente
+        destination: Ruta de destino (archivo o directorio)
+        
+    Returns:
+        Ruta final del archivo copiado
+        
+    Raises:
+        shutil.SameFileError: Si origen y destino son el mismo archivo
+    """
+    src = os.fspath(source)
+    dst = os.fspath(destination)
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    
+    if _COPY_FILE2 is None:
+        shutil.copyfile(src, dst)
+        return dst
+    
+    # Igual que shutil.copyfile: nunca copiar un archivo sobre sí mismo
+    existed = os.path.exists(dst)
+    if existed and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} y {dst!r} son el mismo archivo")
+    
+    try:
+        _COPY_FILE2(src, dst, None)
+    except BaseException:
+        # No dejar un destino a medio copiar, pero nunca borrar un archivo
+        # que ya existía antes de esta llamada
+        if not existed:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+        raise
+    return dst
 
 
 def copy_file(source: str | Path, destination: str | Path, 
@@ -74,10 +161,11 @@ def copy_file(source: str | Path, destination: str | Path,
         True si fue exitoso
     """
     try:
+        copied = _fast_copy(source, destination)
         if preserve_metadata:
-            shutil.copy2(source, destination)
+            shutil.copystat(source, copied)
         else:
-            shutil.copy(source, destination)
+            shutil.copymode(source, copied)
         log.debug(f"Archivo copiado: {source} → {destination}")
         return True
     except Exception as e:
@@ -161,6 +249,94 @@ def get_file_size_mb(path: str | Path) -> Optional[float]:
     return round(size_bytes / (1024 * 1024), 2) if size_bytes else None
 
 
+def _scan_directory(directory: str, pattern: str,
+                    suffix: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    Lee un único directorio con os.scandir.
+    
+    Args:
+        directory: Directorio a leer
+        pattern: Patrón (glob) que deben cumplir los nombres de archivo
+        suffix: Extensión en minúsculas que deben tener los archivos (opcional)
+        
+    Returns:
+        Tupla (archivos que cumplen el patrón, subdirectorios)
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif (entry.is_file()
+                      and fnmatch.fnmatch(entry.name, pattern)
+                      and (suffix is None or entry.name.lower().endswith(suffix))):
+                    files.append(entry.path)
+    except OSError as e:
+        # Como os.walk: un directorio ilegible (sin permiso, borrado a mitad
+        # del recorrido, enlace roto, error de red) se omite sin cortar la búsqueda
+        log.debug(f"No se pudo leer {directory}: {e}")
+    return files, subdirs
+
+
+def _scan_executor() -> ThreadPoolExecutor:
+    """Devuelve el pool de hilos de recorrido, creándolo la primera vez."""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            _scan_pool = ThreadPoolExecutor(max_workers=SCAN_WORKERS,
+                                            thread_name_prefix='sgdi-scan')
+        return _scan_pool
+
+
+def _parallel_scan(directory: str | Path, pattern: str,
+                   suffix: Optional[str] = None) -> List[str]:
+    """
+    Recorre un árbol de directorios en paralelo (BFS con pool de hilos).
+    
+    La lectura de directorios libera el GIL, por lo que varios hilos aceleran
+    el recorrido de árboles grandes y rutas de red. Los resultados se reúnen
+    en el hilo llamador, sin estado compartido entre workers, y se devuelven
+    ordenados para que el resultado no dependa de qué hilo termina antes.
+    
+    Args:
+        directory: Directorio raíz
+        pattern: Patrón (glob) que deben cumplir los nombres de archivo
+        suffix: Extensión en minúsculas que deben tener los archivos (opcional)
+        
+    Returns:
+        Lista de rutas (str) de los archivos encontrados
+    """
+    executor = _scan_executor()
+    results = []
+    pending = {executor.submit(_scan_directory, os.fspath(directory), pattern, suffix)}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                results.extend(files)
+                pending.update(
+                    executor.submit(_scan_directory, subdir, pattern, suffix)
+                    for subdir in subdirs
+                )
+    finally:
+        # Si un directorio falla, no dejar trabajo encolado en el pool compartido
+        for future in pending:
+            future.cancel()
+    results.sort()
+    return results
+
+
+def _normalize_suffix(file_type: Optional[str]) -> Optional[str]:
+    """Extensión en minúsculas con punto ('PDF' -> '.pdf'); None si no hay filtro."""
+    if not file_type:
+        return None
+    suffix = file_type.lower()
+    return suffix if suffix.startswith('.') else f'.{suffix}'
+
+
 def find_files(directory: str | Path, pattern: str = "*", 
                recursive: bool = True, file_type: Optional[str] = None) -> List[Path]:
     """
@@ -181,20 +357,16 @@ def find_files(directory: str | Path, pattern: str = "*",
         log.warning(f"Directorio no existe: {directory}")
         return []
     
+    # El filtro por tipo se aplica durante el recorrido, no en otra pasada
+    suffix = _normalize_suffix(file_type)
+    
     try:
         if recursive:
-            files = list(directory.rglob(pattern))
+            paths = _parallel_scan(directory, pattern, suffix)
         else:
-            files = list(directory.glob(pattern))
-        
-        # Filtrar solo archivos (no directorios)
-        files = [f for f in files if f.is_file()]
-        
-        # Filtrar por tipo si se especifica
-        if file_type:
-            if not file_type.startswith('.'):
-                file_type = f'.{file_type}'
-            files = [f for f in files if f.suffix.lower() == file_type.lower()]
+            paths, _ = _scan_directory(directory, pattern, suffix)
+            paths.sort()
+        files = [Path(p) for p in paths]
         
         log.debug(f"Encontrados {len(files)} archivos en {directory}")
         return files
@@ -204,6 +376,72 @@ def find_files(directory: str | Path, pattern: str = "*",
         return []
 
 
+def _walk_scandir(directory: str | Path) -> Iterator[os.DirEntry]:
+    """
+    Recorre un árbol de directorios con os.scandir (pila explícita).
+    
+    Reutiliza la información cacheada de cada DirEntry, por lo que no crea
+    objetos Path ni repite stat() por entrada. Los directorios que no se
+    pueden leer se omiten.
+    
+    Args:
+        directory: Directorio raíz
+        
+    Yields:
+        DirEntry de cada archivo regular encontrado
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError as e:
+            log.debug(f"No se pudo leer {current}: {e}")
+
+
+def find_files_iter(directory: str | Path, pattern: str = "*",
+                    recursive: bool = True, file_type: Optional[str] = None) -> Iterator[Path]:
+    """
+    Busca archivos de forma perezosa (generador).
+    
+    Mismos argumentos y filtros que find_files, pero no materializa la
+    lista (ni la ordena): útil cuando solo se cuentan los resultados o se
+    procesan uno a uno en árboles grandes.
+    
+    Args:
+        directory: Directorio donde buscar
+        pattern: Patrón de búsqueda (glob)
+        recursive: Si buscar en subdirectorios
+        file_type: Extensión de archivo (ej: '.pdf', '.txt')
+        
+    Yields:
+        Ruta de cada archivo que cumple el patrón
+    """
+    directory = Path(directory)
+    
+    if not directory.exists():
+        log.warning(f"Directorio no existe: {directory}")
+        return
+    
+    suffix = _normalize_suffix(file_type)
+    
+    if recursive:
+        for entry in _walk_scandir(directory):
+            if (fnmatch.fnmatch(entry.name, pattern)
+                    and (suffix is None or entry.name.lower().endswith(suffix))):
+                yield Path(entry.path)
+        return
+    
+    paths, _ = _scan_directory(directory, pattern, suffix)
+    for path in paths:
+        yield Path(path)
+
+
 def get_directory_size(directory: str | Path) -> Tuple[int, int]:
     """
     Calcula el tamaño total de un directorio.
@@ -214,43 +452,130 @@ def get_directory_size(directory: str | Path) -> Tuple[int, int]:
     Returns:
         Tupla (tamaño_bytes, cantidad_archivos)
     """
-    directory = Path(directory)
     total_size = 0
     file_count = 0
     
     try:
-        for file_path in directory.rglob('*'):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-                file_count += 1
+        for entry in _walk_scandir(directory):
+            total_size += entry.stat(follow_symlinks=False).st_size
+            file_count += 1
         return total_size, file_count
     except Exception as e:
         log.error(f"Error al calcular tamaño de {directory}: {e}")
         return 0, 0
 
 
-def calculate_file_hash(file_path: str | Path, algorithm: str = 'md5') -> Optional[str]:
+def _hash_constructor(algorithm: str) -> Callable:
+    """Retorna el constructor directo del algoritmo (p. ej. hashlib.blake2b)."""
+    if algorithm in hashlib.algorithms_guaranteed:
+        return getattr(hashlib, algorithm)
+    return partial(hashlib.new, algorithm)
+
+
+def _digest_file(f, algorithm: str, buffer: Optional[bytearray] = None) -> str:
+    """
+    Calcula el hash de un archivo ya abierto (binario, sin buffer).
+    
+    En POSIX se pide lectura anticipada secuencial y, al terminar, se libera
+    el archivo de la caché de páginas para no desplazar datos más usados.
+    
+    Args:
+        f: Archivo abierto con open(..., 'rb', buffering=0)
+        algorithm: Algoritmo de hash
+        buffer: Buffer reutilizable para la lectura (opcional)
+        
+    Returns:
+        Hash en hexadecimal
+    """
+    _fadvise(f, 'POSIX_FADV_SEQUENTIAL')
+    try:
+        return _hash_stream(f, algorithm, buffer)
+    finally:
+        _fadvise(f, 'POSIX_FADV_DONTNEED')
+
+
+def _fadvise(f, advice: str) -> None:
+    """
+    Envía una sugerencia de caché (posix_fadvise) si el sistema la admite.
+    
+    Es solo una pista: en pipes, FUSE y algunos sistemas de archivos falla
+    con EINVAL/ESPIPE, y ese error no debe impedir calcular el hash.
+    """
+    fadvise = getattr(os, 'posix_fadvise', None)
+    if fadvise is None:
+        return
+    try:
+        fadvise(f.fileno(), 0, 0, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def _hash_stream(f, algorithm: str, buffer: Optional[bytearray] = None) -> str:
+    """Lee el archivo completo y retorna su hash en hexadecimal."""
+    constructor = _hash_constructor(algorithm)
+    if buffer is None and hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(f, constructor).hexdigest()
+    
+    # Bloques leídos con readinto sobre un único buffer (el del llamador
+    # si lo pasa, para no asignar uno nuevo por archivo)
+    hash_obj = constructor()
+    buf = buffer if buffer is not None else bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        hash_obj.update(view[:n])
+    return hash_obj.hexdigest()
+
+
+def calculate_file_hash(file_path: str | Path, algorithm: str = 'md5',
+                        buffer: Optional[bytearray] = None) -> Optional[str]:
     """
     Calcula el hash de un archivo.
     
+    El valor por defecto (md5) se mantiene por compatibilidad con hashes ya
+    guardados; para huellas nuevas conviene pedir 'blake2b' (más rápido).
+    
     Args:
         file_path: Ruta del archivo
-        algorithm: Algoritmo de hash ('md5', 'sha256', etc.)
+        algorithm: Algoritmo de hash ('md5', 'blake2b', 'sha256', etc.)
+        buffer: bytearray reutilizable entre llamadas al procesar muchos archivos
         
     Returns:
         Hash del archivo o None si hay error
     """
     try:
-        hash_obj = hashlib.new(algorithm)
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        # Sin buffer de Python: la lectura por bloques se hace en C
+        with open(file_path, 'rb', buffering=0) as f:
+            return _digest_file(f, algorithm, buffer)
     except Exception as e:
         log.error(f"Error al calcular hash de {file_path}: {e}")
         return None
 
 
+def fingerprint(file_path: str | Path, algorithm: str = 'blake2b',
+                buffer: Optional[bytearray] = None) -> Optional[Tuple[int, str]]:
+    """
+    Obtiene tamaño y hash de un archivo con una sola apertura.
+    
+    Args:
+        file_path: Ruta del archivo
+        algorithm: Algoritmo de hash
+        buffer: bytearray reutilizable entre llamadas al procesar muchos archivos
+        
+    Returns:
+        Tupla (tamaño en bytes, hash) o None si hay error
+    """
+    try:
+        with open(file_path, 'rb', buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            return size, _digest_file(f, algorithm, buffer)
+    except Exception as e:
+        log.error(f"Error al calcular huella de {file_path}: {e}")
+        return None
+
+
 def is_path_safe(path: str | Path, base_directory: Optional[str | Path] = None) -> bool:
     """
     Verifica si una ruta es segura (no sale del directorio base).
@@ -263,20 +588,31 @@ def is_path_safe(path: str | Path, base_directory: Optional[str | Path] = None)
         True si la ruta es segura
     """
     try:
+        # Sin caché: los enlaces simbólicos pueden cambiar entre llamadas
         path = Path(path).resolve()
         
         if base_directory:
             base = Path(base_directory).resolve()
             # Verificar que la ruta está dentro del directorio base
-            return str(path).startswith(str(base))
+            return path.is_relative_to(base)
         
         # Si no hay directorio base, solo verificar que la ruta no tiene '..'
-        return '..' not in Path(path).parts
+        return '..' not in path.parts
         
     except Exception:
         return False
 
 
+# Caracteres no permitidos en nombres de archivo de Windows
+INVALID_FILENAME_CHARS = '<>:"/\\|?*'
+
+
+@lru_cache(maxsize=8)
+def _invalid_chars_table(replacement: str) -> dict:
+    """Tabla de str.translate que reemplaza los caracteres no permitidos."""
+    return str.maketrans({char: replacement for char in INVALID_FILENAME_CHARS})
+
+
 def sanitize_filename(filename: str, replacement: str = '_') -> str:
     """
     Sanitiza un nombre de archivo removiendo caracteres no permitidos.
@@ -288,20 +624,11 @@ def sanitize_filename(filename: str, replacement: str = '_') -> str:
     Returns:
         Nombre de archivo sanitizado
     """
-    # Caracteres no permitidos en Windows
-    invalid_chars = '<>:"/\\|?*'
-    
-    for char in invalid_chars:
-        filename = filename.replace(char, replacement)
+    filename = filename.translate(_invalid_chars_table(replacement))
     
-    # Remover espacios al inicio y final
-    filename = filename.strip()
-    
-    # Asegurar que no termine con punto (no permitido en Windows)
-    while filename.endswith('.'):
-        filename = filename[:-1]
-    
-    return filename
+    # Remover espacios al inicio y final y asegurar que no termine con punto
+    # (no permitido en Windows)
+    return filename.strip().rstrip('.')
 
 
 def create_backup(file_path: str | Path, backup_suffix: str = '.bak') -> Optional[Path]:
@@ -319,7 +646,8 @@ def create_backup(file_path: str | Path, backup_suffix: str = '.bak') -> Optiona
         file_path = Path(file_path)
         backup_path = file_path.with_suffix(file_path.suffix + backup_suffix)
         
-        shutil.copy2(file_path, backup_path)
+        _fast_copy(file_path, backup_path)
+        shutil.copystat(file_path, backup_path)
         log.info(f"Backup creado: {backup_path}")
         return backup_path
         
@@ -341,16 +669,13 @@ def get_temp_file(prefix: str = 'sgdi_', suffix: str = '.tmp',
     Returns:
         Ruta del archivo temporal
     """
-    import tempfile
-    import uuid
-    
     if directory is None:
         from config.settings import Settings
         directory = Settings.DEFAULT_TEMP_PATH
     
     ensure_directory(directory)
     
-    unique_id = str(uuid.uuid4())[:8]
+    unique_id = os.urandom(4).hex()
     filename = f"{prefix}{unique_id}{suffix}"
     
     return Path(directory) / filename
@@ -366,8 +691,10 @@ __all__ = [
     'get_file_size',
     'get_file_size_mb',
     'find_files',
+    'find_files_iter',
     'get_directory_size',
     'calculate_file_hash',
+    'fingerprint',
     'is_path_safe',
     'sanitize_filename',
     'create_backup',
@@ -6,19 +6,29 @@ Sistema de logging centralizado usando loguru.
 Proporciona logging a archivo con rotación automática y registro en base de datos.
 """
 
+import atexit
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from loguru import logger
 from typing import Optional
+from functools import lru_cache
 import traceback as tb
 
 from config.settings import Settings
 
+# Logs a BD: se escriben por lotes desde un hilo en segundo plano
+DB_LOG_BATCH_SIZE = 100
+DB_LOG_FLUSH_INTERVAL = 0.2  # segundos
+
 
 class SGDILogger:
     """Clase para gestión centralizada de logging."""
     
     _initialized = False
+    _init_lock = threading.Lock()
     
     @classmethod
     def initialize(cls):
@@ -26,6 +36,13 @@ class SGDILogger:
         if cls._initialized:
             return
         
+        with cls._init_lock:
+            if not cls._initialized:
+                cls._configure()
+    
+    @classmethod
+    def _configure(cls):
+        """Configura los destinos de loguru (se llama una sola vez)."""
         # Asegurar que los directorios existen
         Settings.ensure_directories()
         
@@ -98,7 +115,10 @@ class SGDILogger:
     def log_to_database(cls, module: str, action: str, level: str, message: str, 
                        error: Exception = None, extra_data: dict = None):
         """
-        Registra un log importante en la base de datos.
+        Encola un log importante para registrarlo en la base de datos.
+        
+        La escritura la hace un hilo en segundo plano que agrupa los logs
+        en una transacción por lote, sin bloquear al llamador.
         
         Args:
             module: Nombre del módulo
@@ -108,29 +128,134 @@ class SGDILogger:
             error: Excepción si hay error
             extra_data: Datos adicionales
         """
-        try:
-            from core.database.simple_db import get_db
-            
-            traceback_str = None
-            if error:
-                traceback_str = ''.join(tb.format_exception(
-                    type(error),
-                    error,
-                    error.__traceback__
-                ))
-            
-            db = get_db()
-            db.log_to_database(
-                module=module,
-                action=action,
-                level=level,
-                message=message,
-                traceback=traceback_str,
-                extra_data=extra_data
+        _start_db_log_worker()
+        _DB_LOG_QUEUE.put((module, action, level, message, error, extra_data))
+
+
+# Cola de logs pendientes de escribir en BD (None = detener el hilo)
+_DB_LOG_QUEUE = queue.SimpleQueue()
+_db_log_worker = None
+_db_log_worker_lock = threading.Lock()
+
+
+def _start_db_log_worker():
+    """Arranca el hilo escritor de logs a BD si aún no existe."""
+    global _db_log_worker
+    if _db_log_worker is not None:
+        return
+    
+    with _db_log_worker_lock:
+        if _db_log_worker is None:
+            _db_log_worker = threading.Thread(
+                target=_db_log_worker_loop, name="sgdi-db-log", daemon=True
             )
+            _db_log_worker.start()
+            atexit.register(_flush_db_logs)
+
+
+def _write_db_logs(db, batch: list):
+    """
+    Escribe un lote de logs en la base de datos.
+    
+    Si el lote falla se reintenta una vez tras reconectar y, si vuelve a
+    fallar, se insertan los logs de a uno para perder solo los inválidos.
+    
+    Args:
+        db: Conexión propia del hilo escritor
+        batch: Tuplas (module, action, level, message, error, extra_data)
+    """
+    entries = []
+    for module, action, level, message, error, extra_data in batch:
+        traceback_str = None
+        if error:
+            traceback_str = ''.join(tb.format_exception(
+                type(error),
+                error,
+                error.__traceback__
+            ))
+        entries.append((module, action, level, message, traceback_str, extra_data))
+    
+    try:
+        db.log_many_to_database(entries)
+        return
+    except Exception as e:
+        logger.warning(f"Error al guardar logs en base de datos, reintentando: {e}")
+    
+    # Reintento con una conexión nueva (p. ej. tras un corte breve)
+    try:
+        db.disconnect()
+    except Exception:
+        pass
+    try:
+        db.log_many_to_database(entries)
+        return
+    except Exception as e:
+        logger.warning(f"Reintento fallido, guardando logs uno por uno: {e}")
+    
+    # Uno por uno: una fila inválida no descarta el resto del lote
+    for entry in entries:
+        try:
+            db.log_many_to_database([entry])
         except Exception as e:
             # Si falla el log a BD, solo loguear a archivo
+            logger.error(f"Error al guardar log en base de datos ({entry[0]}/{entry[1]}): {e}")
+
+
+def _db_log_worker_loop():
+    """Consume la cola de logs y los escribe en lotes."""
+    db = None
+    running = True
+    
+    while running:
+        item = _DB_LOG_QUEUE.get()
+        if item is None:
+            break
+        
+        batch = [item]
+        deadline = time.monotonic() + DB_LOG_FLUSH_INTERVAL
+        while len(batch) < DB_LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _DB_LOG_QUEUE.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                running = False
+                break
+            batch.append(item)
+        
+        try:
+            if db is None:
+                # Conexión propia: la global pertenece al hilo de la GUI.
+                # get_db() espera a que la global termine de aplicar el
+                # esquema; esta conexión no repite esa verificación ni su DDL
+                from core.database.simple_db import Database, get_db
+                get_db()
+                db = Database(initialize=False)
+        except Exception as e:
             logger.error(f"Error al guardar log en base de datos: {e}")
+            continue
+        
+        _write_db_logs(db, batch)
+    
+    if db is not None:
+        db.disconnect()
+
+
+def _flush_db_logs(timeout: float = 5.0):
+    """Detiene el hilo escritor tras vaciar la cola (al salir)."""
+    if _db_log_worker is None or not _db_log_worker.is_alive():
+        return
+    _DB_LOG_QUEUE.put(None)
+    _db_log_worker.join(timeout)
+
+
+@lru_cache(maxsize=256)
+def _bind(name: str):
+    """Devuelve el logger ligado a un nombre (memorizado por nombre)."""
+    return logger.bind(name=name)
 
 
 def get_logger(name: str = None):
@@ -147,7 +272,8 @@ def get_logger(name: str = None):
         >>> log = get_logger(__name__)
         >>> log.info("Mensaje de prueba")
     """
-    return SGDILogger.get_logger(name)
+    # El módulo ya inicializó el logging al importarse
+    return _bind(name) if name else logger
 
 
 def log_operation(module: str, action: str, success: bool = True, 
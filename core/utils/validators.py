@@ -7,14 +7,41 @@ Funciones de validación para diferentes tipos de datos y archivos.
 
 import os
 import re
+import shutil
+import stat
 from pathlib import Path
 from typing import Optional, Tuple
-from PIL import Image
 
 from core.utils.logger import get_logger
 
 log = get_logger(__name__)
 
+# Código INACAL: 10 caracteres A-Z/0-9 con al menos una letra
+_INACAL_RE = re.compile(r'(?=[0-9]*[A-Z])[A-Z0-9]{10}')
+
+# Firmas de los formatos de imagen habituales (WEBP y BMP se comprueban aparte)
+_IMAGE_MAGIC = (
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+    (b'II*\x00', 'TIFF'),
+    (b'MM\x00*', 'TIFF'),
+)
+_SNIFFED_FORMATS = frozenset(fmt for _, fmt in _IMAGE_MAGIC) | {'WEBP', 'BMP'}
+
+# Tamaños válidos de la cabecera DIB de un BMP (BITMAPCOREHEADER ... BITMAPV5HEADER)
+_BMP_DIB_SIZES = frozenset((12, 40, 52, 56, 64, 108, 124))
+
+# Bytes leídos para identificar el formato (BMP necesita hasta la cabecera DIB)
+_SNIFF_SIZE = 18
+
+# En Windows os.open abre en modo texto salvo que se pida O_BINARY
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+# Patrón básico de email
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 def validate_file_exists(file_path: str | Path) -> Tuple[bool, str]:
     """
@@ -26,15 +53,17 @@ def validate_file_exists(file_path: str | Path) -> Tuple[bool, str]:
     Returns:
         Tupla (es_válido, mensaje_error)
     """
+    # Un solo stat responde a "existe" y "es archivo"
     try:
-        path = Path(file_path)
-        if not path.exists():
-            return False, f"El archivo no existe: {file_path}"
-        if not path.is_file():
-            return False, f"La ruta no es un archivo: {file_path}"
-        return True, ""
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return False, f"El archivo no existe: {file_path}"
     except Exception as e:
         return False, f"Error al validar archivo: {e}"
+    
+    if not stat.S_ISREG(st.st_mode):
+        return False, f"La ruta no es un archivo: {file_path}"
+    return True, ""
 
 
 def validate_directory_exists(directory_path: str | Path) -> Tuple[bool, str]:
@@ -47,15 +76,17 @@ def validate_directory_exists(directory_path: str | Path) -> Tuple[bool, str]:
     Returns:
         Tupla (es_válido, mensaje_error)
     """
+    # Un solo stat responde a "existe" y "es directorio"
     try:
-        path = Path(directory_path)
-        if not path.exists():
-            return False, f"El directorio no existe: {directory_path}"
-        if not path.is_dir():
-            return False, f"La ruta no es un directorio: {directory_path}"
-        return True, ""
+        st = os.stat(directory_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return False, f"El directorio no existe: {directory_path}"
     except Exception as e:
         return False, f"Error al validar directorio: {e}"
+    
+    if not stat.S_ISDIR(st.st_mode):
+        return False, f"La ruta no es un directorio: {directory_path}"
+    return True, ""
 
 
 def validate_file_extension(file_path: str | Path, 
@@ -95,44 +126,116 @@ def validate_pdf_file(file_path: str | Path) -> Tuple[bool, str]:
     Returns:
         Tupla (es_válido, mensaje_error)
     """
-    # Validar extensión
-    valid, msg = validate_file_extension(file_path, ['.pdf'])
-    if not valid:
-        return False, msg
-    
-    # Validar que el archivo existe
-    valid, msg = validate_file_exists(file_path)
-    if not valid:
-        return False, msg
+    path_str = os.fspath(file_path)
+    if not path_str.lower().endswith('.pdf'):
+        return False, "Extensión no permitida. Se esperaba: .pdf"
     
-    # Validar que es un PDF real (verificar magic bytes)
+    # Una sola apertura comprueba existencia y cabecera (magic bytes)
     try:
-        with open(file_path, 'rb') as f:
-            header = f.read(4)
-            if header != b'%PDF':
-                return False, "El archivo no es un PDF válido (header incorrecto)"
-        return True, ""
+        fd = os.open(path_str, _O_RDONLY_BINARY)
+        try:
+            header = os.read(fd, 5)
+        finally:
+            os.close(fd)
+    except FileNotFoundError:
+        return False, f"El archivo no existe: {file_path}"
+    except IsADirectoryError:
+        return False, f"La ruta no es un archivo: {file_path}"
     except Exception as e:
         return False, f"Error al leer PDF: {e}"
+    
+    if not header.startswith(b'%PDF-'):
+        return False, "El archivo no es un PDF válido (header incorrecto)"
+    return True, ""
+
+
+def _sniff_image_format(file_path: str | Path) -> Optional[str]:
+    """
+    Identifica el formato de una imagen por sus primeros bytes.
+    
+    Args:
+        file_path: Ruta del archivo de imagen
+        
+    Returns:
+        Nombre del formato (como PIL) o None si no se reconoce
+    """
+    fd = os.open(file_path, _O_RDONLY_BINARY)
+    try:
+        head = os.read(fd, _SNIFF_SIZE)
+    finally:
+        os.close(fd)
+    
+    for magic, fmt in _IMAGE_MAGIC:
+        if head.startswith(magic):
+            return fmt
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP'
+    if _is_bmp_header(head):
+        return 'BMP'
+    return None
+
+
+def _is_bmp_header(head: bytes) -> bool:
+    """
+    Verifica la cabecera de un BMP, no solo las letras "BM".
+    
+    Args:
+        head: Primeros bytes del archivo (al menos 18)
+        
+    Returns:
+        True si la cabecera DIB y el offset de los píxeles son coherentes
+    """
+    if len(head) < _SNIFF_SIZE or head[:2] != b'BM':
+        return False
+    pixel_offset = int.from_bytes(head[10:14], 'little')
+    dib_size = int.from_bytes(head[14:18], 'little')
+    return dib_size in _BMP_DIB_SIZES and pixel_offset >= 14 + dib_size
 
 
 def validate_image_file(file_path: str | Path, 
-                       allowed_formats: Optional[list[str]] = None) -> Tuple[bool, str]:
+                       allowed_formats: Optional[list[str]] = None,
+                       deep: bool = False) -> Tuple[bool, str]:
     """
     Valida que un archivo es una imagen válida.
     
+    Por defecto solo se comprueban los bytes iniciales del archivo; PIL se
+    usa cuando se pide validación profunda o el formato no se reconoce.
+    
     Args:
         file_path: Ruta del archivo de imagen
         allowed_formats: Formatos permitidos (ej: ['PNG', 'JPEG'])
+        deep: Si True, decodifica la cabecera completa con PIL
         
     Returns:
         Tupla (es_válido, mensaje_error)
     """
+    if not deep:
+        try:
+            fmt = _sniff_image_format(file_path)
+        except FileNotFoundError:
+            return False, f"El archivo no existe: {file_path}"
+        except IsADirectoryError:
+            return False, f"La ruta no es un archivo: {file_path}"
+        except OSError as e:
+            return False, f"El archivo no es una imagen válida: {e}"
+        
+        if fmt is not None:
+            if allowed_formats and fmt not in allowed_formats:
+                return False, f"Formato no permitido. Se esperaba: {', '.join(allowed_formats)}"
+            return True, ""
+        
+        # Formato desconocido: solo PIL puede decidir si es otro formato permitido
+        if allowed_formats and _SNIFFED_FORMATS.issuperset(allowed_formats):
+            return False, "El archivo no es una imagen válida: formato no reconocido"
+    
     valid, msg = validate_file_exists(file_path)
     if not valid:
         return False, msg
     
     try:
+        # PIL es pesado: solo se importa cuando hace falta decodificar
+        from PIL import Image
+        
         with Image.open(file_path) as img:
             # Verificar que se puede abrir
             img.verify()
@@ -177,6 +280,11 @@ def validate_inacal_code(code: str) -> Tuple[bool, str]:
     Returns:
         Tupla (es_válido, mensaje_error)
     """
+    # Camino rápido: una sola pasada para el caso válido (el más frecuente)
+    if code and _INACAL_RE.fullmatch(code):
+        return True, ""
+    
+    # Código inválido: determinar el motivo
     if not code or not code.strip():
         return False, "El código está vacío"
     
@@ -261,8 +369,6 @@ def validate_disk_space(path: str | Path, required_mb: float) -> Tuple[bool, str
         Tupla (es_válido, mensaje_error)
     """
     try:
-        import shutil
-        
         path = Path(path)
         if path.is_file():
             path = path.parent
@@ -291,10 +397,7 @@ def validate_email(email: str) -> Tuple[bool, str]:
     if not email or not email.strip():
         return False, "El email está vacío"
     
-    # Patrón básico de email
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(pattern, email):
+    if not _EMAIL_RE.match(email):
         return False, "El formato del email no es válido"
     
     return True, ""
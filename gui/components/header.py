@@ -30,6 +30,7 @@ class Header(ttk.Frame):
         
         self.main_window = main_window
         self.current_module_label = None
+        self._last_clock = ""
         
         # Crear componentes
         self._create_left_section()
@@ -41,25 +42,24 @@ class Header(ttk.Frame):
     
     def _create_left_section(self):
         """Crea la sección izquierda (título y módulo actual)."""
-        left_frame = ttk.Frame(self, bootstyle="primary")
-        left_frame.pack(side=LEFT, fill=Y)
+        # Los widgets van directo en el header (sin frame intermedio)
         
         # Título
         ttk.Label(
-            left_frame,
+            self,
             text="SGDI",
             font=("Segoe UI", 16, "bold"),
             bootstyle="inverse-primary"
         ).pack(side=LEFT, padx=(0, 15))
         
         # Separador
-        ttk.Separator(left_frame, orient=VERTICAL, bootstyle="light").pack(
+        ttk.Separator(self, orient=VERTICAL, bootstyle="light").pack(
             side=LEFT, fill=Y, padx=10
         )
         
         # Módulo actual
         self.current_module_label = ttk.Label(
-            left_frame,
+            self,
             text="Dashboard",
             font=("Segoe UI", 11),
             bootstyle="inverse-primary"
@@ -82,12 +82,11 @@ class Header(ttk.Frame):
     
     def _create_right_section(self):
         """Crea la sección derecha (info del sistema y reloj)."""
-        right_frame = ttk.Frame(self, bootstyle="primary")
-        right_frame.pack(side=RIGHT, fill=Y)
+        # Los widgets van directo en el header (sin frame intermedio)
         
         # Reloj
         self.clock_label = ttk.Label(
-            right_frame,
+            self,
             text="",
             font=("Segoe UI", 11, "bold"),
             bootstyle="inverse-primary"
@@ -95,13 +94,13 @@ class Header(ttk.Frame):
         self.clock_label.pack(side=RIGHT, padx=(15, 0))
         
         # Separador
-        ttk.Separator(right_frame, orient=VERTICAL, bootstyle="light").pack(
+        ttk.Separator(self, orient=VERTICAL, bootstyle="light").pack(
             side=RIGHT, fill=Y, padx=10
         )
         
         # Info
         ttk.Label(
-            right_frame,
+            self,
             text=f"v{Settings.APP_VERSION}",
             font=("Segoe UI", 9),
             bootstyle="inverse-primary"
@@ -110,13 +109,15 @@ class Header(ttk.Frame):
     def _update_clock(self):
         """Actualiza el reloj en tiempo real."""
         now = datetime.now()
-        time_str = now.strftime("%H:%M:%S")
-        date_str = now.strftime("%d/%m/%Y")
+        clock_str = now.strftime("%d/%m/%Y %H:%M:%S")
         
-        self.clock_label.config(text=f"{date_str} {time_str}")
+        # Solo tocar el widget si el texto visible cambió
+        if clock_str != self._last_clock:
+            self.clock_label.config(text=clock_str)
+            self._last_clock = clock_str
         
-        # Actualizar cada segundo
-        self.after(1000, self._update_clock)
+        # Actualizar al inicio del siguiente segundo
+        self.after(1000 - now.microsecond // 1000, self._update_clock)
     
     def _on_refresh(self):
         """Maneja el click en el botón de refrescar."""
@@ -5,6 +5,8 @@ SGDI - Sidebar de Navegación
 Componente de navegación lateral con menú de módulos.
 """
 
+from functools import partial
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
@@ -30,6 +32,10 @@ class Sidebar(ttk.Frame):
         self.buttons = {}
         self.current_button = None
         
+        # Mensajes de estado precalculados por tab (se llenan en _create_menu)
+        self._hover_msgs = {}
+        self._active_msgs = {}
+        
         # Configurar frame
         self.configure(width=250)
         
@@ -124,6 +130,12 @@ class Sidebar(ttk.Frame):
             },
         ]
         
+        # Mensajes de la barra de estado: se formatean una sola vez
+        for item in menu_items:
+            if 'id' in item:
+                self._hover_msgs[item['id']] = item.get('description')
+                self._active_msgs[item['id']] = f"Módulo activo: {item['text']}"
+        
         # Crear botones
         for item in menu_items:
             if item.get('separator'):
@@ -141,39 +153,37 @@ class Sidebar(ttk.Frame):
             parent: Widget padre
             item: Diccionario con datos del botón
         """
-        btn_frame = ttk.Frame(parent)
-        btn_frame.pack(fill=X, pady=2, padx=5)
-        
-        # Botón principal
+        # Botón principal (directo en el menú, sin frame contenedor)
         btn = ttk.Button(
-            btn_frame,
+            parent,
             text=f"{item['icon']}  {item['text']}",
-            command=lambda: self._on_menu_click(item['id']),
+            command=partial(self._on_menu_click, item['id']),
             bootstyle="light-outline",
             cursor="hand2"
         )
-        btn.pack(fill=X, ipady=8)
+        btn.pack(fill=X, ipady=8, pady=2, padx=5)
+        btn.tab_id = item['id']
         
         # Tooltip/descripción
         if item.get('description'):
-            # Crear tooltip simple
-            def on_enter(e):
-                self.main_window.set_status_message(item['description'])
-            
-            def on_leave(e):
-                if self.main_window.current_tab == item['id']:
-                    self.main_window.set_status_message(
-                        f"Módulo activo: {item['text']}"
-                    )
-                else:
-                    self.main_window.set_status_message("Listo")
-            
-            btn.bind('<Enter>', on_enter)
-            btn.bind('<Leave>', on_leave)
+            btn.bind('<Enter>', self._on_button_enter)
+            btn.bind('<Leave>', self._on_button_leave)
         
         # Guardar referencia
         self.buttons[item['id']] = btn
     
+    def _on_button_enter(self, event):
+        """Muestra la descripción del módulo bajo el cursor."""
+        self.main_window.set_status_message(self._hover_msgs[event.widget.tab_id])
+    
+    def _on_button_leave(self, event):
+        """Restaura el mensaje de estado al salir de un botón."""
+        tab_id = event.widget.tab_id
+        if self.main_window.current_tab == tab_id:
+            self.main_window.set_status_message(self._active_msgs[tab_id])
+        else:
+            self.main_window.set_status_message("Listo")
+    
     def _on_menu_click(self, tab_id: str):
         """
         Maneja el click en un botón del menú.
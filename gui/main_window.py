@@ -6,7 +6,9 @@ Ventana principal de la aplicación con sidebar de navegación y área de conten
 """
 
 import importlib
+import queue
 import tkinter as tk
+from threading import Thread
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from typing import Dict, Callable, Optional
@@ -18,10 +20,25 @@ from gui.components.header import Header
 
 log = get_logger(__name__)
 
+# Bootstyle de la barra de estado según el tipo de mensaje
+_STATUS_STYLES = {
+    "success": "inverse-success",
+    "warning": "inverse-warning",
+    "danger": "inverse-danger",
+    "info": "inverse-secondary",
+}
+
 
 class MainWindow:
     """Ventana principal de la aplicación SGDI."""
     
+    # Tabs a precargar en segundo plano tras mostrar el dashboard
+    PREWARM_TABS = 2
+    # Espera (ms) antes de precargar cada tab
+    PREWARM_DELAY_MS = 500
+    # Intervalo (ms) para revisar los tabs importados en segundo plano
+    TAB_POLL_MS = 50
+    
     def __init__(self, root: ttk.Window):
         """
         Inicializa la ventana principal.
@@ -33,6 +50,12 @@ class MainWindow:
         self.current_tab = None
         self.tabs: Dict[str, ttk.Frame] = {}
         self._status_timer_id = None
+        # Tabs cuyo módulo se está importando en segundo plano
+        self._loading: set = set()
+        # Resultados (tab_id, error) de los hilos de importación; solo el
+        # hilo de Tk los consume (Tk no es thread-safe)
+        self._tab_results: queue.SimpleQueue = queue.SimpleQueue()
+        self._tab_poll_id = None
         
         # Configurar ventana
         self._configure_window()
@@ -46,18 +69,26 @@ class MainWindow:
         # Mostrar dashboard por defecto
         self.show_tab("dashboard")
         
+        # Precargar los siguientes tabs cuando la UI quede ociosa
+        self.root.after(self.PREWARM_DELAY_MS, self._prewarm_tabs)
+        
         log.info("Ventana principal inicializada")
     
     def _configure_window(self):
         """Configura las propiedades de la ventana principal."""
         self.root.title(Settings.WINDOW_TITLE)
         
-        # Tamaño de ventana
-        width, height = map(int, Settings.WINDOW_SIZE.split('x'))
-        self.root.geometry(f"{width}x{height}")
+        # Restaurar la geometría de la sesión anterior; si no hay, tamaño por
+        # defecto centrado (place_window_center fuerza un update_idletasks)
+        saved = self._load_geometry()
+        if saved:
+            self.root.geometry(saved)
+        else:
+            width, height = Settings.WINDOW_WH
+            self.root.geometry(f"{width}x{height}")
+            self.root.place_window_center()
         
-        # Centrar ventana
-        self.root.place_window_center()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Configurar grid
         self.root.columnconfigure(0, weight=0)  # Sidebar (fijo)
@@ -66,6 +97,23 @@ class MainWindow:
         self.root.rowconfigure(1, weight=1)     # Contenido (expandible)
         self.root.rowconfigure(2, weight=0)     # Status bar (fijo)
     
+    @staticmethod
+    def _load_geometry() -> Optional[str]:
+        """Lee la geometría guardada ("WxH+X+Y"), o None si no existe."""
+        try:
+            return Settings.WINDOW_GEOMETRY_FILE.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+    
+    def _on_close(self):
+        """Guarda la geometría de la ventana y la cierra."""
+        try:
+            if self.root.state() == "normal":
+                Settings.WINDOW_GEOMETRY_FILE.write_text(self.root.geometry(), encoding="utf-8")
+        except Exception as e:
+            log.warning(f"No se pudo guardar la geometría de la ventana: {e}")
+        self.root.destroy()
+    
     def _create_main_structure(self):
         """Crea la estructura principal de la ventana."""
         # Header (barra superior)
@@ -82,6 +130,14 @@ class MainWindow:
         self.content_frame.columnconfigure(0, weight=1)
         self.content_frame.rowconfigure(0, weight=1)
         
+        # Placeholder mientras se carga un tab por primera vez
+        self._loading_label = ttk.Label(
+            self.content_frame,
+            text="Cargando módulo…",
+            font=("Segoe UI", 14),
+            bootstyle="secondary"
+        )
+        
         # Status bar (barra inferior)
         self.status_bar = ttk.Label(
             self.root,
@@ -151,43 +207,150 @@ class MainWindow:
             return
         
         try:
-            # Ocultar tab actual si existe
+            # Ocultar tab actual (o el placeholder de carga) si existe
             if self.current_tab and self.tabs[self.current_tab].get('instance'):
                 current_instance = self.tabs[self.current_tab]['instance']
                 if hasattr(current_instance, 'grid_forget'):
                     current_instance.grid_forget()
+            self._loading_label.grid_forget()
             
-            # Lazy import: importar la clase solo la primera vez que se necesita
-            if self.tabs[tab_id]['class'] is None:
-                mod = importlib.import_module(self.tabs[tab_id]['module_path'])
-                self.tabs[tab_id]['class'] = getattr(mod, self.tabs[tab_id]['class_name'])
-                log.debug(f"Módulo importado: {tab_id}")
+            self.current_tab = tab_id
             
-            # Crear instancia del tab si no existe (lazy loading)
+            # Primera vez: importar el módulo en segundo plano (lazy loading)
             if self.tabs[tab_id]['instance'] is None:
-                tab_class = self.tabs[tab_id]['class']
-                self.tabs[tab_id]['instance'] = tab_class(self.content_frame)
-                log.debug(f"Tab creado: {tab_id}")
+                self._loading_label.grid(row=0, column=0)
+                self.set_status_message(f"Cargando módulo: {self.tabs[tab_id]['name']}…")
+                if tab_id not in self._loading:
+                    self._start_tab_import(tab_id)
+                return
             
-            # Mostrar nuevo tab
-            tab_instance = self.tabs[tab_id]['instance']
-            tab_instance.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+            self._activate_tab(tab_id)
             
-            # Actualizar estado
-            self.current_tab = tab_id
-            tab_name = self.tabs[tab_id]['name']
-            self.set_status_message(f"Módulo activo: {tab_name}")
-            
-            # Notificar al header
-            if hasattr(self.header, 'update_current_module'):
-                self.header.update_current_module(tab_name)
+        except Exception as e:
+            log.exception(f"Error al mostrar tab {tab_id}: {e}")
+            self.set_status_message(f"Error al cargar módulo: {str(e)}", "danger")
+    
+    def _prewarm_tabs(self, remaining: int = PREWARM_TABS):
+        """
+        Precarga un tab aún no creado y agenda el siguiente.
+        
+        El tab se importa en segundo plano y se instancia sin mostrarse,
+        para que el primer clic del usuario sea inmediato.
+        
+        Args:
+            remaining: Cantidad de tabs que quedan por precargar
+        """
+        if remaining <= 0:
+            return
+        
+        tab_id = next(
+            (tid for tid, tab in self.tabs.items()
+             if tab['instance'] is None and tid not in self._loading),
+            None
+        )
+        if tab_id is None:
+            return
+        
+        self._start_tab_import(tab_id)
+        log.debug(f"Precargando tab: {tab_id}")
+        
+        self.root.after(self.PREWARM_DELAY_MS, lambda: self._prewarm_tabs(remaining - 1))
+    
+    def _start_tab_import(self, tab_id: str):
+        """
+        Lanza la importación de un tab en segundo plano y el sondeo de resultados.
+        
+        Args:
+            tab_id: ID del tab a importar
+        """
+        self._loading.add(tab_id)
+        Thread(target=self._import_tab_thread, args=(tab_id,), daemon=True).start()
+        if self._tab_poll_id is None:
+            self._tab_poll_id = self.root.after(self.TAB_POLL_MS, self._poll_tab_results)
+    
+    def _poll_tab_results(self):
+        """Finaliza (en el hilo de Tk) los tabs cuya importación terminó."""
+        self._tab_poll_id = None
+        while True:
+            try:
+                tab_id, error = self._tab_results.get_nowait()
+            except queue.Empty:
+                break
+            self._finalize_tab(tab_id, error)
+        
+        if self._loading:
+            self._tab_poll_id = self.root.after(self.TAB_POLL_MS, self._poll_tab_results)
+    
+    def _import_tab_thread(self, tab_id: str):
+        """
+        Importa el módulo de un tab fuera del hilo de Tk.
+        
+        La importación (pandas, PIL, qrcode...) es lo costoso y no toca
+        widgets; el resultado va a la cola y la instancia se crea luego en
+        el hilo principal (_poll_tab_results). Este hilo no llama a Tk.
+        
+        Args:
+            tab_id: ID del tab a importar
+        """
+        tab = self.tabs[tab_id]
+        try:
+            if tab['class'] is None:
+                mod = importlib.import_module(tab['module_path'])
+                tab['class'] = getattr(mod, tab['class_name'])
+                log.debug(f"Módulo importado: {tab_id}")
+            error = None
+        except Exception as e:
+            error = e
+        self._tab_results.put((tab_id, error))
+    
+    def _finalize_tab(self, tab_id: str, error: Optional[Exception]):
+        """
+        Crea la instancia del tab (hilo de Tk) y la muestra si sigue activo.
+        
+        Args:
+            tab_id: ID del tab importado
+            error: Excepción de la importación, o None si fue exitosa
+        """
+        self._loading.discard(tab_id)
+        is_current = self.current_tab == tab_id
+        if is_current:
+            self._loading_label.grid_forget()
+        
+        try:
+            if error is not None:
+                raise error
             
-            log.info(f"Tab mostrado: {tab_id}")
+            tab_class = self.tabs[tab_id]['class']
+            self.tabs[tab_id]['instance'] = tab_class(self.content_frame)
+            log.debug(f"Tab creado: {tab_id}")
             
+            # El usuario pudo cambiar de tab mientras se cargaba
+            if is_current:
+                self._activate_tab(tab_id)
+        
         except Exception as e:
-            log.error(f"Error al mostrar tab {tab_id}: {e}")
-            log.exception(e)
-            self.set_status_message(f"Error al cargar módulo: {str(e)}", "danger")
+            log.exception(f"Error al mostrar tab {tab_id}: {e}")
+            if is_current:
+                self.set_status_message(f"Error al cargar módulo: {str(e)}", "danger")
+    
+    def _activate_tab(self, tab_id: str):
+        """
+        Muestra un tab ya instanciado y actualiza estado y header.
+        
+        Args:
+            tab_id: ID del tab a mostrar
+        """
+        tab_instance = self.tabs[tab_id]['instance']
+        tab_instance.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+        
+        tab_name = self.tabs[tab_id]['name']
+        self.set_status_message(f"Módulo activo: {tab_name}")
+        
+        # Notificar al header
+        if hasattr(self.header, 'update_current_module'):
+            self.header.update_current_module(tab_name)
+        
+        log.info(f"Tab mostrado: {tab_id}")
     
     def set_status_message(self, message: str, style: str = "info"):
         """
@@ -197,17 +360,11 @@ class MainWindow:
             message: Mensaje a mostrar
             style: Estilo del mensaje (info, success, warning, danger)
         """
-        self.status_bar.config(text=message)
-        
-        # Cambiar color según estilo
-        if style == "success":
-            self.status_bar.config(bootstyle="inverse-success")
-        elif style == "warning":
-            self.status_bar.config(bootstyle="inverse-warning")
-        elif style == "danger":
-            self.status_bar.config(bootstyle="inverse-danger")
-        else:
-            self.status_bar.config(bootstyle="inverse-secondary")
+        # Texto y color en una sola llamada a Tk
+        self.status_bar.config(
+            text=message,
+            bootstyle=_STATUS_STYLES.get(style, "inverse-secondary")
+        )
         
         # Auto-resetear después de 5 segundos (excepto errores)
         # Cancelar timer anterior para evitar acumulación infinita
@@ -216,9 +373,12 @@ class MainWindow:
             self._status_timer_id = None
         
         if style != "danger" and message != "Listo":
-            self._status_timer_id = self.root.after(
-                5000, lambda: self.set_status_message("Listo")
-            )
+            self._status_timer_id = self.root.after(5000, self._reset_status)
+    
+    def _reset_status(self):
+        """Vuelve la barra de estado a "Listo" sin agendar nuevos timers."""
+        self._status_timer_id = None
+        self.status_bar.config(text="Listo", bootstyle="inverse-secondary")
     
     def refresh_current_tab(self):
         """Refresca el tab actual."""
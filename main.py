@@ -56,8 +56,7 @@ def main():
         
     except Exception as e:
         error_msg = f"Error crítico: {e}"
-        log.error(error_msg)
-        log.exception(e)
+        log.exception(error_msg)
         
         print("\n" + "="*60)
         print("ERROR CRÍTICO")
@@ -655,14 +655,18 @@ class CodeGeneratorTab(ttk.Frame):
             return
         
         try:
-            for nro_serie, codigo, tipo_servicio in self.generated_results:
-                # Guardar en columnas separadas
-                self.generator.db.save_generated_code(
-                    code=codigo,
-                    meter_serial=nro_serie,
-                    service_type=tipo_servicio,
-                    article_name=f"{nro_serie} - {tipo_servicio}"  # Para compatibility
-                )
+            db = self.generator.db
+            with db.transaction():
+                for nro_serie, codigo, tipo_servicio in self.generated_results:
+                    # Guardar en columnas separadas (si el código ya estaba
+                    # guardado se actualizan serie y servicio, sin revertir
+                    # el resto del lote)
+                    db.upsert_generated_code(
+                        code=codigo,
+                        meter_serial=nro_serie,
+                        service_type=tipo_servicio,
+                        article_name=f"{nro_serie} - {tipo_servicio}"  # Para compatibility
+                    )
             
             messagebox.showinfo(
                 "Guardado",
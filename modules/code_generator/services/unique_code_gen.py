@@ -220,26 +220,47 @@ class CodeGenerator:
         
         successful = []
         errors = []
+        rows = []
+        batch_codes = set()
         
         log.info(f"Generando {count} códigos INACAL...")
         
         for i in range(count):
             success, code = self.generate_code(prefix)
+            # Los códigos del lote aún no están en BD: evitar repetidos entre sí
+            while success and code in batch_codes:
+                success, code = self.generate_code(prefix)
             
             if success:
                 successful.append(code)
-                
-                # Guardar en BD
-                if save_to_db:
-                    try:
-                        article_name = f"{article_prefix} {i+1}"
-                        self.db.save_generated_code(code, article_name)
-                    except Exception as e:
-                        log.warning(f"No se pudo guardar código {code} en BD: {e}")
+                batch_codes.add(code)
+                rows.append((code, f"{article_prefix} {i+1}", None))
             else:
                 errors.append(f"Error al generar código {i+1}: {code}")
                 log.warning(f"Fallo al generar código {i+1}: {code}")
         
+        # Guardar todo el lote con un solo INSERT multi-fila
+        if save_to_db and rows:
+            try:
+                with self.db.transaction():
+                    # Códigos insertados por otra sesión desde generate_code;
+                    # el bloqueo impide que aparezcan más hasta el commit
+                    taken = self.db.existing_codes(batch_codes, for_update=True)
+                    rows = [row for row in rows if row[0] not in taken]
+                    inserted = self.db.save_generated_codes_bulk(rows)
+                    if inserted != len(rows):
+                        raise RuntimeError(f"se insertaron {inserted} de {len(rows)} códigos")
+            except Exception as e:
+                # La transacción se revirtió: ningún código del lote quedó guardado
+                log.error(f"No se pudo guardar el lote de {len(rows)} códigos en BD: {e}")
+                errors.extend(f"Código {code} no guardado en BD: {e}" for code in successful)
+                successful = []
+            else:
+                for code in taken:
+                    errors.append(f"Código {code} ya existe en BD (generado en otra sesión)")
+                    log.warning(f"Código duplicado descartado del lote: {code}")
+                successful = [code for code in successful if code not in taken]
+        
         duration = time.time() - start_time
         
         # Log de operación
@@ -199,14 +199,17 @@ class StatsAnalyzer:
         """
         Obtiene resumen completo del sistema.
         
+        Las consultas se leen en una sola transacción READ COMMITTED.
+        
         Returns:
             Diccionario con todas las estadísticas
         """
-        return {
-            "qr": self.get_qr_stats(),
-            "codes": self.get_codes_stats(),
-            "file_ops": self.get_file_operations_stats(),
-            "module_usage": self.get_module_usage(),
-            "recent_activity": self.get_recent_activity(5)
-        }
+        with self.db.read_committed():
+            return {
+                "qr": self.get_qr_stats(),
+                "codes": self.get_codes_stats(),
+                "file_ops": self.get_file_operations_stats(),
+                "module_usage": self.get_module_usage(),
+                "recent_activity": self.get_recent_activity(5)
+            }
 
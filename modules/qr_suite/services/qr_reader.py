@@ -45,11 +45,10 @@ from typing import List, Dict, Optional, Tuple, Callable
 from pyzbar.pyzbar import decode
 from PIL import Image
 from pdf2image import convert_from_path
-import hashlib
 import shutil
 
 from core.utils.logger import get_logger, log_operation
-from core.utils.file_handler import ensure_directory, sanitize_filename
+from core.utils.file_handler import ensure_directory, sanitize_filename, fingerprint
 from core.utils.validators import validate_pdf_file, validate_image_file
 from core.database.simple_db import get_db
 from config.settings import Settings
@@ -244,7 +243,7 @@ class QRReader:
                 - "renombrar": Agrega sufijo numérico (_1, _2, etc.)
                 - "sobrescribir": Reemplaza el archivo existente
                 - "saltar": No procesa el archivo duplicado
-                - "comparar": Compara MD5, solo renombra si son diferentes
+                - "comparar": Compara tamaño y hash, solo renombra si son diferentes
                 Defaults to "renombrar".
             
         Returns:
@@ -367,7 +366,7 @@ class QRReader:
                 - "renombrar": Genera nombre único agregando sufijo (_1, _2...)
                 - "sobrescribir": Elimina archivo existente y usa el nombre
                 - "saltar": No mueve el archivo, retorna None
-                - "comparar": Calcula MD5 de ambos archivos:
+                - "comparar": Compara tamaño y hash de ambos archivos:
                   * Si son iguales: salta (retorna None)
                   * Si son diferentes: renombra
             
@@ -391,11 +390,10 @@ class QRReader:
             return None
         
         elif policy == "comparar":
-            # Comparar por MD5
-            source_hash = self._calculate_md5(source_path)
-            dest_hash = self._calculate_md5(dest_path)
+            # Comparar por tamaño y hash (una sola lectura por archivo)
+            source_fp = fingerprint(source_path)
             
-            if source_hash == dest_hash:
+            if source_fp is not None and source_fp == fingerprint(dest_path):
                 # Son iguales, saltar
                 return None
             else:
@@ -446,28 +444,6 @@ class QRReader:
             if counter > 1000:  # Límite de seguridad
                 raise RuntimeError("No se pudo generar nombre único")
     
-    def _calculate_md5(self, file_path: Path) -> str:
-        """Calcula el hash MD5 de un archivo.
-        
-        Lee el archivo en chunks para eficiencia de memoria y calcula
-        su hash MD5. Útil para comparar si dos archivos son idénticos.
-        
-        Args:
-            file_path (Path): Ruta al archivo a procesar.
-            
-        Returns:
-            str: Hash MD5 en formato hexadecimal (32 caracteres).
-        
-        Note:
-            Lee en bloques de 4096 bytes para no cargar archivos
-            grandes completos en memoria.
-        """
-        md5_hash = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                md5_hash.update(chunk)
-        return md5_hash.hexdigest()
-    
     def process_directory(self,
                          input_folder: str | Path,
                          output_folder: str | Path,
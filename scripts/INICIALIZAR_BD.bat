@@ -0,0 +1,28 @@
+@echo off
+echo ====================================================
+echo   INICIALIZACION DE LA BASE DE DATOS MYSQL
+echo ====================================================
+echo.
+echo Aplica core\database\schema_mysql.sql (tablas y vistas) con
+echo el cliente nativo mysql. El procedimiento y el evento de
+echo refresco del dashboard los crea la aplicacion al iniciar.
+echo El script es idempotente: puede ejecutarse varias veces.
+echo.
+echo Usa DB_HOST, DB_PORT, DB_USER y DB_NAME si estan definidas.
+echo.
+pause
+
+cd /d "%~dp0\.."
+if "%DB_HOST%"=="" set DB_HOST=localhost
+if "%DB_PORT%"=="" set DB_PORT=3306
+if "%DB_USER%"=="" set DB_USER=root
+if "%DB_NAME%"=="" set DB_NAME=sgdi
+
+REM Crear la base (si falta) y aplicar el esquema en una sola sesion
+(
+    echo CREATE DATABASE IF NOT EXISTS `%DB_NAME%` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+    echo USE `%DB_NAME%`;
+    type "core\database\schema_mysql.sql"
+) | mysql --default-character-set=utf8mb4 -h %DB_HOST% -P %DB_PORT% -u %DB_USER% -p
+
+pause
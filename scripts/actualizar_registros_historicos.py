@@ -8,10 +8,10 @@ Migra datos de article_name a meter_serial para códigos históricos.
 import sys
 from pathlib import Path
 
-project_root = Path(__file__).parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from core.database.simple_db import get_db
+from core.database.simple_db import Database
 from core.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -24,7 +24,20 @@ def update_historical_records():
     print("="*70)
     print()
     
-    db = get_db()
+    # Conexión propia para la carga masiva (sin gap locks)
+    db = Database()
+    db.set_bulk_mode(True)
+    try:
+        _run_update(db)
+    finally:
+        db.set_bulk_mode(False)
+        db.disconnect()
+
+
+def _run_update(db):
+    """Ejecuta la actualización sobre una sesión ya preparada."""
+    # Conteo y actualización en una sola transacción
+    db.begin()
     
     # Contar registros con meter_serial NULL
     result = db.fetch_one(
@@ -36,6 +49,7 @@ def update_historical_records():
     print()
     
     if null_count == 0:
+        db.commit()
         print("✅ Todos los registros ya tienen meter_serial poblado")
         return
     
@@ -44,22 +58,22 @@ def update_historical_records():
     print()
     
     # Actualizar: copiar article_name a meter_serial
-    db.execute(
-        """
-        UPDATE generated_codes 
-        SET meter_serial = article_name
-        WHERE meter_serial IS NULL AND article_name IS NOT NULL
-        """
-    )
-    db.connection.commit()
-    
-    # Verificar
-    result_after = db.fetch_one(
-        "SELECT COUNT(*) as count FROM generated_codes WHERE meter_serial IS NULL"
-    )
-    remaining = result_after['count'] if result_after else 0
+    try:
+        db.execute(
+            """
+            UPDATE generated_codes 
+            SET meter_serial = article_name
+            WHERE meter_serial IS NULL AND article_name IS NOT NULL
+            """
+        )
+        updated = db.cursor.rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     
-    updated = null_count - remaining
+    # Los restantes se deducen del conteo inicial (sin un segundo escaneo)
+    remaining = null_count - updated
     
     print("="*70)
     print(" RESULTADO ".center(70))
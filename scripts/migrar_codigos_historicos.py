@@ -5,60 +5,89 @@ Script de migración de códigos desde archivos Excel
 Lee TODOS los archivos Excel de C:\INACAL-PDF\ y migra los códigos a la BD.
 """
 
+import math
+import os
+import re
 import sys
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+import openpyxl
 import pandas as pd
 from datetime import datetime
 
 # Agregar ruta del proyecto
-project_root = Path(__file__).parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from core.database.simple_db import get_db
+from core.database.simple_db import Database
 from core.utils.logger import get_logger
 
 log = get_logger(__name__)
 
+# Hilos para leer archivos Excel en paralelo (solapan la lectura de disco
+# y la descompresión; con procesos, en Windows cada worker reimportaría el
+# script y configuraría otra vez los logs)
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Extensiones de los archivos Excel a migrar
+EXCEL_SUFFIXES = ('.xlsx', '.xls')
+
+# Encabezados de columna (sin tildes y en minúsculas): código de seguridad
+# o un encabezado "Código" a secas (exportación del generador), y artículo/serie
+_CODIGO_RE = re.compile(r'^(?:(?=.*seguridad).*cod(?:igo|e)|\s*codigo\s*$)', re.DOTALL)
+_ARTICULO_RE = re.compile(r'articulo|serie|nro')
+
+
+def _write_lines(lines: List[str]):
+    """Escribe un bloque de líneas en stdout con una sola escritura."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 
 def migrate_from_excel_folder(folder_path: str = r"C:\INACAL-PDF"):
     """Migra todos los códigos desde archivos Excel."""
-    print("="*70)
-    print(" MIGRACIÓN MASIVA DE CÓDIGOS DESDE EXCEL ".center(70))
-    print("="*70)
-    print()
+    _write_lines([
+        "="*70,
+        " MIGRACIÓN MASIVA DE CÓDIGOS DESDE EXCEL ".center(70),
+        "="*70,
+        "",
+    ])
     
     folder = Path(folder_path)
     
     if not folder.exists():
-        print(f"❌ ERROR: Carpeta no encontrada:")
-        print(f"   {folder_path}")
+        _write_lines(["❌ ERROR: Carpeta no encontrada:", f"   {folder_path}"])
         return
     
-    print(f"📂 Carpeta: {folder}")
-    print()
+    _write_lines([f"📂 Carpeta: {folder}", "", "🔍 Buscando archivos Excel..."])
     
     # Buscar archivos Excel
-    print("🔍 Buscando archivos Excel...")
-    excel_files = list(folder.glob("*.xlsx")) + list(folder.glob("*.xls"))
-    
-    # Filtrar solo los que parecen ser de códigos generados
-    codigo_files = [f for f in excel_files if "codigo" in f.name.lower()]
+    # Una sola pasada: extensión Excel y "codigo" en el nombre
+    with os.scandir(folder) as entries:
+        codigo_files = [
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith(EXCEL_SUFFIXES)
+            and "codigo" in entry.name.lower()
+            and entry.is_file()
+        ]
     
-    print(f"✅ Encontrados {len(codigo_files)} archivos de códigos")
-    print()
+    lines = [f"✅ Encontrados {len(codigo_files)} archivos de códigos", ""]
     
     if not codigo_files:
-        print("⚠️  No se encontraron archivos Excel de códigos")
-        print("    Buscando archivos con 'codigo' en el nombre...")
+        lines.append("⚠️  No se encontraron archivos Excel de códigos")
+        lines.append("    Buscando archivos con 'codigo' en el nombre...")
+        _write_lines(lines)
         return
     
     # Mostrar archivos encontrados
-    print("📄 Archivos a procesar:")
-    for idx, f in enumerate(codigo_files[:10], 1):
-        print(f"  {idx}. {f.name}")
+    lines.append("📄 Archivos a procesar:")
+    lines.extend(f"  {idx}. {f.name}" for idx, f in enumerate(codigo_files[:10], 1))
     if len(codigo_files) > 10:
-        print(f"  ... y {len(codigo_files) - 10} archivos más")
-    print()
+        lines.append(f"  ... y {len(codigo_files) - 10} archivos más")
+    lines.append("")
+    _write_lines(lines)
     
     # Confirmar
     response = input(f"¿Procesar {len(codigo_files)} archivos? (s/n): ")
@@ -66,122 +95,224 @@ def migrate_from_excel_folder(folder_path: str = r"C:\INACAL-PDF"):
         print("❌ Cancelado")
         return
     
-    print()
-    print("="*70)
-    print(" PROCESANDO ARCHIVOS ".center(70))
-    print("="*70)
-    print()
+    _write_lines(["", "="*70, " PROCESANDO ARCHIVOS ".center(70), "="*70, ""])
+    
+    # Conexión propia para la carga masiva (sin gap locks)
+    db = Database()
+    db.set_bulk_mode(True)
+    try:
+        _process_files(db, codigo_files)
+    finally:
+        db.set_bulk_mode(False)
+        db.disconnect()
+
+
+def _fold_header(name: str) -> str:
+    """Encabezado sin tildes y en minúsculas ("Código" -> "codigo")."""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _detect_columns(names: List[str]) -> Optional[Tuple[int, int]]:
+    """
+    Ubica las columnas de código y artículo a partir de los encabezados.
+    
+    Args:
+        names: Encabezados de la hoja como texto
+        
+    Returns:
+        Tupla (índice código, índice artículo) o None si no hay columna de códigos
+    """
+    names = [_fold_header(name) for name in names]
+    codigo_idx = next((i for i, name in enumerate(names) if _CODIGO_RE.search(name)), None)
+    if codigo_idx is None:
+        # Intentar segunda columna por defecto
+        if len(names) < 2:
+            return None
+        codigo_idx = 1
+    
+    # Artículo/serie; por defecto la primera columna
+    articulo_idx = next((i for i, name in enumerate(names) if _ARTICULO_RE.search(name)), 0)
+    return codigo_idx, articulo_idx
+
+
+def _cell_text(value) -> Optional[str]:
+    """
+    Texto de una celda, igual para openpyxl y pandas.
+    
+    Los números enteros guardados como float pierden el ".0"
+    (12345678.0 -> "12345678"); vacíos y NaN retornan None.
+    
+    Args:
+        value: Valor crudo de la celda
+        
+    Returns:
+        Texto sin espacios extremos, o None si la celda está vacía
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _collect_pairs(rows: Iterable[Tuple[Any, Any]]) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Aplica la regla de validez común a las filas (codigo, articulo) de una hoja.
+    
+    Las filas con ambas celdas vacías no se cuentan. Un código es válido si
+    tiene al menos 8 caracteres; el artículo vacío se guarda como "Importado".
     
-    # Conectar BD
-    db = get_db()
-    existing_codes = set(db.get_all_codes())
+    Args:
+        rows: Pares de valores crudos (codigo, articulo)
+        
+    Returns:
+        Tupla (filas leídas, [(codigo, articulo)] válidos)
+    """
+    total = 0
+    pairs = []
+    for codigo, articulo in rows:
+        codigo = _cell_text(codigo)
+        articulo = _cell_text(articulo)
+        if codigo is None and articulo is None:
+            continue
+        total += 1
+        if codigo is not None and len(codigo) >= 8:
+            pairs.append((codigo, articulo or "Importado"))
+    return total, pairs
+
+
+def _parse_xlsx(excel_file: Path) -> Tuple[int, List[Tuple[str, str]], Optional[str]]:
+    """Lee un .xlsx fila por fila con openpyxl (modo read-only, sin DataFrame)."""
+    wb = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        headers = next(rows, ())
+        columns = _detect_columns(['' if h is None else str(h) for h in headers])
+        if columns is None:
+            return 0, [], "⚠️  No se encontró columna de códigos"
+        codigo_idx, articulo_idx = columns
+        
+        total, pairs = _collect_pairs(
+            (row[codigo_idx] if codigo_idx < len(row) else None,
+             row[articulo_idx] if articulo_idx < len(row) else None)
+            for row in rows
+        )
+        return total, pairs, None
+    finally:
+        wb.close()
+
+
+def _parse_xls(excel_file: Path) -> Tuple[int, List[Tuple[str, str]], Optional[str]]:
+    """Lee un .xls (formato antiguo, no soportado por openpyxl) con pandas."""
+    # Leer solo la fila de encabezados para ubicar las columnas
+    header = pd.read_excel(excel_file, nrows=0).columns
+    columns = _detect_columns(list(header.astype(str)))
+    if columns is None:
+        return 0, [], "⚠️  No se encontró columna de códigos"
+    codigo_col, articulo_col = (header[i] for i in columns)
+    
+    # Leer solo las columnas necesarias (por posición); los valores crudos
+    # pasan por la misma normalización que el camino openpyxl
+    df = pd.read_excel(excel_file, usecols=sorted(set(columns)))
+    total, pairs = _collect_pairs(zip(df[codigo_col], df[articulo_col]))
+    return total, pairs, None
+
+
+def parse_excel_file(excel_file: Path) -> Tuple[int, List[Tuple[str, str]], Optional[str]]:
+    """
+    Lee un archivo Excel de códigos y retorna sus filas válidas.
     
+    Se ejecuta en un hilo del pool: no usa la BD ni estado compartido;
+    los duplicados los descarta la BD al insertar (UNIQUE(code)).
+    
+    Args:
+        excel_file: Ruta del archivo Excel
+        
+    Returns:
+        Tupla (filas leídas, [(codigo, articulo)], mensaje de error o None)
+    """
+    try:
+        if excel_file.suffix.lower() == '.xls':
+            return _parse_xls(excel_file)
+        return _parse_xlsx(excel_file)
+    
+    except Exception as e:
+        return 0, [], f"❌ Error al leer archivo: {e}"
+
+
+def _process_files(db, codigo_files: list):
+    """Importa los códigos de cada archivo Excel e imprime el resumen."""
     total_rows = 0
     total_imported = 0
     total_skipped = 0
     total_errors = 0
     
-    # Procesar cada archivo
-    for idx, excel_file in enumerate(codigo_files, 1):
-        print(f"[{idx}/{len(codigo_files)}] {excel_file.name}...")
+    # Los archivos se leen en paralelo; la BD solo se usa en este hilo
+    workers = min(PARSE_WORKERS, len(codigo_files))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(parse_excel_file, codigo_files)
         
-        try:
-            # Leer Excel
-            df = pd.read_excel(excel_file)
-            
-            # Buscar columna de códigos
-            codigo_col = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                if 'codigo' in col_lower or 'code' in col_lower:
-                    if 'seguridad' in col_lower or col == 'Código':
-                        codigo_col = col
-                        break
-            
-            if codigo_col is None:
-                # Intentar segunda columna por defecto
-                if len(df.columns) >= 2:
-                    codigo_col = df.columns[1]
-                else:
-                    print(f"  ⚠️  No se encontró columna de códigos")
-                    total_errors += 1
-                    continue
+        for idx, (excel_file, (file_rows, pairs, error)) in enumerate(
+                zip(codigo_files, results), 1):
+            print(f"[{idx}/{len(codigo_files)}] {excel_file.name}...")
             
-            # Buscar columna de artículo/serie
-            articulo_col = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                if 'articulo' in col_lower or 'serie' in col_lower or 'nro' in col_lower:
-                    articulo_col = col
-                    break
+            if error:
+                print(f"  {error}")
+                total_errors += 1
+                continue
             
-            if articulo_col is None and len(df.columns) >= 1:
-                articulo_col = df.columns[0]
+            total_rows += file_rows
             
-            # Procesar filas
-            file_imported = 0
-            file_skipped = 0
+            try:
+                # Guardar el archivo completo: un INSERT IGNORE multi-fila y un
+                # commit; UNIQUE(code) descarta los duplicados (en BD o en el archivo)
+                rows = [(codigo, articulo, None) for codigo, articulo in pairs]
+                file_imported = db.save_generated_codes_bulk(rows) if rows else 0
+            except Exception as e:
+                print(f"  ❌ Error al guardar códigos: {e}")
+                total_errors += 1
+                continue
             
-            for _, row in df.iterrows():
-                total_rows += 1
-                
-                try:
-                    codigo = str(row[codigo_col]).strip()
-                    articulo = str(row[articulo_col]).strip() if articulo_col else "Importado"
-                    
-                    # Validar código
-                    if not codigo or codigo == 'nan' or len(codigo) < 8:
-                        continue
-                    
-                    # Verificar duplicados
-                    if codigo in existing_codes:
-                        file_skipped += 1
-                        total_skipped += 1
-                        continue
-                    
-                    # Guardar
-                    db.save_generated_code(codigo, articulo)
-                    existing_codes.add(codigo)
-                    file_imported += 1
-                    total_imported += 1
-                    
-                except Exception as e:
-                    total_errors += 1
-                    continue
+            file_skipped = len(pairs) - file_imported
+            total_imported += file_imported
+            total_skipped += file_skipped
             
             print(f"  ✅ {file_imported} importados | ⏭️  {file_skipped} duplicados")
             
             # Mostrar progreso global cada 10 archivos
             if idx % 10 == 0:
                 print(f"\n  📊 Progreso global: {total_imported} códigos importados\n")
-            
-        except Exception as e:
-            print(f"  ❌ Error al leer archivo: {e}")
-            total_errors += 1
-            continue
     
-    print()
-    print("="*70)
-    print(" RESULTADO FINAL ".center(70))
-    print("="*70)
-    print(f"📁 Archivos procesados: {len(codigo_files)}")
-    print(f"📝 Filas analizadas:    {total_rows}")
-    print(f"✅ Códigos importados:  {total_imported}")
-    print(f"⏭️  Códigos duplicados:  {total_skipped}")
-    print(f"❌ Errores:             {total_errors}")
-    print(f"📊 Total en BD:         {len(db.get_all_codes())}")
-    print("="*70)
-    print()
+    lines = [
+        "",
+        "="*70,
+        " RESULTADO FINAL ".center(70),
+        "="*70,
+        f"📁 Archivos procesados: {len(codigo_files)}",
+        f"📝 Filas analizadas:    {total_rows}",
+        f"✅ Códigos importados:  {total_imported}",
+        f"⏭️  Códigos duplicados:  {total_skipped}",
+        f"❌ Errores:             {total_errors}",
+        f"📊 Total en BD:         {db.count_codes()}",
+        "="*70,
+        "",
+    ]
     
     if total_imported > 0:
-        print("✅ ¡Migración masiva completada!")
-        print()
-        print(f"Se importaron {total_imported:,} códigos históricos.")
-        print("El generador NUNCA repetirá estos códigos.")
+        lines.append("✅ ¡Migración masiva completada!")
+        lines.append("")
+        lines.append(f"Se importaron {total_imported:,} códigos históricos.")
+        lines.append("El generador NUNCA repetirá estos códigos.")
     else:
-        print("ℹ️  No se importaron códigos nuevos (todos ya existían)")
+        lines.append("ℹ️  No se importaron códigos nuevos (todos ya existían)")
     
-    print()
+    lines.append("")
+    _write_lines(lines)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+"""
+Pruebas unitarias de core.utils.file_handler.
+"""
+
+import hashlib
+import os
+import shutil
+
+import pytest
+
+from core.utils import file_handler
+from core.utils.file_handler import _fast_copy, copy_file
+
+
+def test_fast_copy_to_file(tmp_path):
+    src = tmp_path / "origen.txt"
+    src.write_bytes(b"contenido")
+
+    dst = _fast_copy(src, tmp_path / "destino.txt")
+
+    assert (tmp_path / "destino.txt").read_bytes() == b"contenido"
+    assert dst == str(tmp_path / "destino.txt")
+
+
+def test_fast_copy_to_directory(tmp_path):
+    src = tmp_path / "origen.txt"
+    src.write_bytes(b"contenido")
+    target_dir = tmp_path / "sub"
+    target_dir.mkdir()
+
+    dst = _fast_copy(src, target_dir)
+
+    assert dst == str(target_dir / "origen.txt")
+    assert (target_dir / "origen.txt").read_bytes() == b"contenido"
+
+
+@pytest.mark.parametrize("same_target", ["file", "directory"])
+def test_fast_copy_same_file_keeps_source(tmp_path, same_target):
+    src = tmp_path / "origen.txt"
+    src.write_bytes(b"no borrar")
+    destination = src if same_target == "file" else tmp_path
+
+    with pytest.raises(shutil.SameFileError):
+        _fast_copy(src, destination)
+
+    assert src.read_bytes() == b"no borrar"
+
+
+def test_copy_file_same_file_returns_false(tmp_path):
+    src = tmp_path / "origen.txt"
+    src.write_bytes(b"no borrar")
+
+    assert copy_file(src, src) is False
+    assert src.read_bytes() == b"no borrar"
+
+
+def test_fast_copy_removes_partial_destination(tmp_path, monkeypatch):
+    src = tmp_path / "origen.txt"
+    src.write_bytes(b"contenido")
+    dst = tmp_path / "destino.txt"
+
+    def failing_copy(source, destination, params):
+        with open(destination, 'wb') as f:
+            f.write(b"parc")
+        raise OSError("fallo a mitad de la copia")
+
+    monkeypatch.setattr(file_handler, "_COPY_FILE2", failing_copy)
+
+    with pytest.raises(OSError):
+        _fast_copy(src, dst)
+
+    assert not dst.exists()
+
+
+def test_fast_copy_failure_keeps_existing_destination(tmp_path, monkeypatch):
+    src = tmp_path / "origen.txt"
+    src.write_bytes(b"nuevo")
+    dst = tmp_path / "destino.txt"
+    dst.write_bytes(b"respaldo anterior")
+
+    def failing_copy(source, destination, params):
+        raise OSError("archivo bloqueado")
+
+    monkeypatch.setattr(file_handler, "_COPY_FILE2", failing_copy)
+
+    with pytest.raises(OSError):
+        _fast_copy(src, dst)
+
+    assert dst.read_bytes() == b"respaldo anterior"
+
+
+def test_calculate_file_hash_defaults_to_md5(tmp_path):
+    path = tmp_path / "datos.bin"
+    path.write_bytes(b"x" * 5000)
+
+    assert file_handler.calculate_file_hash(path) == hashlib.md5(b"x" * 5000).hexdigest()
+    assert (file_handler.calculate_file_hash(path, 'blake2b')
+            == hashlib.blake2b(b"x" * 5000).hexdigest())
+
+
+def _make_tree(root):
+    for rel in ["b/z.pdf", "b/a.pdf", "a/c/x.pdf", "a/y.txt", "m.pdf", "a/c/d/w.PDF"]:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+
+def test_find_files_matches_sorted_walk(tmp_path):
+    _make_tree(tmp_path)
+    expected = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(tmp_path)
+        for name in names
+        if name.lower().endswith(".pdf")
+    )
+
+    found = file_handler.find_files(tmp_path, file_type="pdf")
+
+    assert [str(p) for p in found] == expected
+
+
+def test_find_files_reuses_scan_pool(tmp_path):
+    _make_tree(tmp_path)
+
+    file_handler.find_files(tmp_path)
+    pool = file_handler._scan_executor()
+    file_handler.find_files(tmp_path)
+
+    assert file_handler._scan_executor() is pool
+
+
+def test_find_files_non_recursive_sorted(tmp_path):
+    for name in ["c.txt", "a.txt", "b.txt"]:
+        (tmp_path / name).write_bytes(b"")
+
+    found = file_handler.find_files(tmp_path, "*.txt", recursive=False)
+
+    assert [p.name for p in found] == ["a.txt", "b.txt", "c.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="sin enlaces simbólicos")
+def test_is_path_safe_sees_retargeted_symlink(tmp_path):
+    base = tmp_path / "base"
+    inside = base / "datos"
+    outside = tmp_path / "fuera"
+    inside.mkdir(parents=True)
+    outside.mkdir()
+    link = base / "enlace"
+    try:
+        link.symlink_to(inside, target_is_directory=True)
+    except OSError:
+        pytest.skip("sin permiso para crear enlaces simbólicos")
+
+    assert file_handler.is_path_safe(link, base)
+
+    link.unlink()
+    link.symlink_to(outside, target_is_directory=True)
+
+    assert not file_handler.is_path_safe(link, base)
+
+
+def test_find_files_skips_unreadable_subdirectory(tmp_path, monkeypatch):
+    _make_tree(tmp_path)
+    broken = os.path.join(str(tmp_path), "b")
+    real_scandir = os.scandir
+
+    def flaky_scandir(path):
+        if os.fspath(path) == broken:
+            raise OSError(5, "error de red simulado")
+        return real_scandir(path)
+
+    monkeypatch.setattr(file_handler.os, "scandir", flaky_scandir)
+
+    found = file_handler.find_files(tmp_path, file_type="pdf")
+
+    assert [p.relative_to(tmp_path).as_posix() for p in found] == [
+        "a/c/d/w.PDF", "a/c/x.pdf", "m.pdf"
+    ]
+
+
+def test_hash_ignores_fadvise_errors(tmp_path, monkeypatch):
+    path = tmp_path / "datos.bin"
+    path.write_bytes(b"abc")
+
+    def failing_fadvise(fd, offset, length, advice):
+        raise OSError(22, "Invalid argument")
+
+    monkeypatch.setattr(file_handler.os, "posix_fadvise", failing_fadvise, raising=False)
+    monkeypatch.setattr(file_handler.os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+    monkeypatch.setattr(file_handler.os, "POSIX_FADV_DONTNEED", 4, raising=False)
+
+    assert file_handler.calculate_file_hash(path) == hashlib.md5(b"abc").hexdigest()
+
+
+@pytest.mark.parametrize("recursive", [True, False])
+def test_find_files_iter_matches_find_files(tmp_path, recursive):
+    _make_tree(tmp_path)
+
+    lazy = sorted(file_handler.find_files_iter(tmp_path, recursive=recursive, file_type="PDF"))
+
+    assert lazy == file_handler.find_files(tmp_path, recursive=recursive, file_type="PDF")
+
+
+@pytest.mark.parametrize("recursive", [True, False])
+def test_find_files_iter_missing_directory(tmp_path, recursive):
+    missing = tmp_path / "no_existe"
+
+    assert list(file_handler.find_files_iter(missing, recursive=recursive)) == []
+    assert file_handler.find_files(missing, recursive=recursive) == []
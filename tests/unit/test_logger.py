@@ -0,0 +1,70 @@
+"""
+Pruebas unitarias de la escritura por lotes de logs a BD (core.utils.logger).
+"""
+
+from core.utils.logger import _write_db_logs
+
+
+class FakeDatabase:
+    """Database mínima: falla según `fail` y registra lo insertado."""
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.calls = 0
+        self.disconnects = 0
+        self.saved = []
+
+    def log_many_to_database(self, entries):
+        self.calls += 1
+        entries = list(entries)
+        if self.fail(self.calls, entries):
+            raise RuntimeError("fallo simulado")
+        self.saved.extend(entries)
+        return len(entries)
+
+    def disconnect(self):
+        self.disconnects += 1
+
+
+def _batch(n):
+    return [("modulo", f"accion{i}", "INFO", f"mensaje {i}", None, None) for i in range(n)]
+
+
+def test_batch_written_once():
+    db = FakeDatabase(lambda call, entries: False)
+
+    _write_db_logs(db, _batch(3))
+
+    assert db.calls == 1
+    assert len(db.saved) == 3
+    assert db.disconnects == 0
+
+
+def test_retry_after_reconnect():
+    db = FakeDatabase(lambda call, entries: call == 1)
+
+    _write_db_logs(db, _batch(3))
+
+    assert db.disconnects == 1
+    assert [e[1] for e in db.saved] == ["accion0", "accion1", "accion2"]
+
+
+def test_bad_row_does_not_drop_batch():
+    # El lote completo falla siempre por la fila "accion1"
+    db = FakeDatabase(lambda call, entries: any(e[1] == "accion1" for e in entries))
+
+    _write_db_logs(db, _batch(3))
+
+    assert [e[1] for e in db.saved] == ["accion0", "accion2"]
+
+
+def test_traceback_is_formatted():
+    db = FakeDatabase(lambda call, entries: False)
+    try:
+        raise ValueError("boom")
+    except ValueError as e:
+        error = e
+
+    _write_db_logs(db, [("modulo", "accion", "ERROR", "mensaje", error, None)])
+
+    assert "ValueError: boom" in db.saved[0][4]
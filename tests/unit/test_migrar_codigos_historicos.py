@@ -0,0 +1,57 @@
+"""
+Pruebas unitarias de las funciones puras de scripts/migrar_codigos_historicos.py.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "migrar_codigos_historicos.py"
+_spec = importlib.util.spec_from_file_location("migrar_codigos_historicos", _SCRIPT)
+migrar = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migrar)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    (float('nan'), None),
+    ("  ", None),
+    (12345678, "12345678"),
+    (12345678.0, "12345678"),
+    (1234.5, "1234.5"),
+    ("  AB12CD34EF ", "AB12CD34EF"),
+])
+def test_cell_text(value, expected):
+    assert migrar._cell_text(value) == expected
+
+
+def test_collect_pairs_shared_rule():
+    rows = [
+        ("AB12CD34EF", "Medidor 1"),
+        (12345678.0, None),          # número entero como float, sin artículo
+        ("CORTO", "Medidor 2"),      # código inválido: se cuenta, no se importa
+        (None, "Medidor 3"),         # sin código: se cuenta, no se importa
+        (None, None),                # fila vacía: no se cuenta
+        (float('nan'), float('nan')),
+    ]
+
+    total, pairs = migrar._collect_pairs(rows)
+
+    assert total == 4
+    assert pairs == [("AB12CD34EF", "Medidor 1"), ("12345678", "Importado")]
+
+
+@pytest.mark.parametrize("names, expected", [
+    (["Nro", "Codigo de Seguridad"], (1, 0)),
+    (["Código Seguridad", "Serie"], (0, 1)),
+    (["Artículo", "SEGURIDAD CODE", "Nro Serie"], (1, 0)),
+    (["Código", "Artículo"], (0, 1)),            # exportación de unique_code_gen
+    ([" codigo ", "otra"], (0, 0)),              # "código" a secas
+    (["Codigo interno", "Descripción"], (1, 0)), # sin 'seguridad' no basta
+    (["Serie\nCodigo seguridad", "x"], (0, 0)),  # encabezado multilínea
+    (["única"], None),
+    ([], None),
+])
+def test_detect_columns(names, expected):
+    assert migrar._detect_columns(names) == expected
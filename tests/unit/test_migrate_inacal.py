@@ -0,0 +1,67 @@
+"""
+Pruebas unitarias del parseo de líneas INACAL (core.database.migrate_inacal).
+"""
+
+import pytest
+
+from core.database.migrate_inacal import (
+    MAX_ERROR_SAMPLES,
+    MIGRATION_NOTE,
+    _iter_inacal_rows,
+)
+
+
+def _new_stats():
+    return {'valid': 0, 'errors': 0, 'error_lines': []}
+
+
+def _parse(lines):
+    stats = _new_stats()
+    rows = list(_iter_inacal_rows(lines, stats))
+    return rows, stats
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Medidor|ABC12345\n", ("ABC12345", "Medidor")),
+    ("  Medidor de agua | ABC12345  \r\n", ("ABC12345", "Medidor de agua")),
+    ("Medidor\t|\tABC12345", ("ABC12345", "Medidor")),
+    ("Medidor|AB 12345\n", ("AB 12345", "Medidor")),
+    ("Árbol ñandú|Ü-001\n", ("Ü-001", "Árbol ñandú")),
+    ("Medidor|ABC12345 \n", ("ABC12345", "Medidor")),
+])
+def test_valid_lines(line, expected):
+    rows, stats = _parse([line])
+
+    assert rows == [expected + (MIGRATION_NOTE,)]
+    assert stats['valid'] == 1
+    assert stats['errors'] == 0
+
+
+@pytest.mark.parametrize("line", [
+    "Medidor|\n",
+    "|ABC12345\n",
+    " | \n",
+    "MedidorABC12345\n",
+    "Medidor|ABC|12345\n",
+])
+def test_malformed_lines_counted_as_errors(line):
+    rows, stats = _parse([line])
+
+    assert rows == []
+    assert stats['errors'] == 1
+    assert stats['error_lines'] == [1]
+
+
+def test_blank_lines_skipped_and_line_numbers_kept():
+    rows, stats = _parse(["\n", "   \r\n", "", "Medidor|A1\n", "mal\n"])
+
+    assert rows == [("A1", "Medidor", MIGRATION_NOTE)]
+    assert stats == {'valid': 1, 'errors': 1, 'error_lines': [5]}
+
+
+def test_error_samples_are_capped():
+    rows, stats = _parse(["mal\n"] * (MAX_ERROR_SAMPLES + 5))
+
+    assert rows == []
+    assert stats['errors'] == MAX_ERROR_SAMPLES + 5
+    assert stats['error_lines'] == list(range(1, MAX_ERROR_SAMPLES + 1))
@@ -0,0 +1,202 @@
+"""
+Pruebas unitarias de core.database.simple_db con una conexión simulada.
+"""
+
+import pytest
+from mysql.connector import Error
+
+from core.database.simple_db import Database
+
+
+class FakeCursor:
+    """Cursor mínimo: registra las sentencias en el log compartido."""
+
+    def __init__(self, log):
+        self.log = log
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        self.log.append(("execute", query))
+
+    def fetchone(self):
+        return {"total": 0}
+
+    def fetchall(self):
+        return []
+
+
+class FakeConnection:
+    """Conexión mínima: registra start_transaction/commit/rollback."""
+
+    def __init__(self, log):
+        self.log = log
+        self.in_transaction = False
+
+    def is_connected(self):
+        return True
+
+    def start_transaction(self):
+        self.in_transaction = True
+        self.log.append(("start_transaction",))
+
+    def commit(self):
+        self.in_transaction = False
+        self.log.append(("commit",))
+
+    def rollback(self):
+        self.in_transaction = False
+        self.log.append(("rollback",))
+
+
+def _fake_db():
+    log = []
+    db = Database(db_config={}, initialize=False)
+    db.connection = FakeConnection(log)
+    db.cursor = FakeCursor(log)
+    return db, log
+
+
+def test_read_committed_sets_isolation_for_one_transaction():
+    db, log = _fake_db()
+
+    with db.read_committed():
+        db.fetch_one("SELECT 1")
+
+    assert log == [
+        ("commit",),
+        ("execute", "SET TRANSACTION ISOLATION LEVEL READ COMMITTED"),
+        ("execute", "SELECT 1"),
+        ("commit",),
+    ]
+
+
+def test_read_committed_inside_transaction_reuses_it():
+    db, log = _fake_db()
+
+    with db.transaction():
+        with db.read_committed():
+            db.fetch_one("SELECT 1")
+
+    assert log == [
+        ("start_transaction",),
+        ("execute", "SELECT 1"),
+        ("commit",),
+    ]
+
+
+def test_recent_logs_use_read_committed():
+    db, log = _fake_db()
+
+    assert db.count_recent_logs(10) == 0
+
+    assert ("execute", "SET TRANSACTION ISOLATION LEVEL READ COMMITTED") in log
+    assert log[-1] == ("commit",)
+
+
+class ChunkCursor(FakeCursor):
+    """Cursor que registra cada executemany y puede fallar en un bloque."""
+
+    def __init__(self, log, fail_on=None):
+        super().__init__(log)
+        self.fail_on = fail_on
+        self.chunks = []
+
+    def executemany(self, query, rows):
+        self.chunks.append(list(rows))
+        if len(self.chunks) == self.fail_on:
+            raise RuntimeError("fallo simulado")
+        self.rowcount = len(rows)
+        self.log.append(("executemany", query))
+
+
+def test_bulk_insert_chunks_in_one_transaction():
+    db, log = _fake_db()
+    db.cursor = ChunkCursor(log)
+    rows = ((i, f"codigo{i}") for i in range(7))
+
+    inserted = db.bulk_insert("generated_codes", ["id", "code"], rows, chunk_size=3)
+
+    assert inserted == 7
+    assert [len(chunk) for chunk in db.cursor.chunks] == [3, 3, 1]
+    assert log[0] == ("start_transaction",)
+    assert log[-1] == ("commit",)
+    assert log.count(("commit",)) == 1
+    assert log[1] == ("executemany",
+                      "INSERT INTO generated_codes (id, code) VALUES (%s, %s)")
+
+
+def test_bulk_insert_ignore_verb():
+    db, log = _fake_db()
+    db.cursor = ChunkCursor(log)
+
+    db.bulk_insert("generated_codes", ["code"], [("a",)], ignore=True)
+
+    assert log[1] == ("executemany", "INSERT IGNORE INTO generated_codes (code) VALUES (%s)")
+
+
+def test_bulk_insert_rolls_back_on_failure():
+    db, log = _fake_db()
+    db.cursor = ChunkCursor(log, fail_on=2)
+
+    with pytest.raises(RuntimeError):
+        db.bulk_insert("generated_codes", ["code"], [(str(i),) for i in range(5)],
+                       chunk_size=2)
+
+    assert log[-1] == ("rollback",)
+    assert ("commit",) not in log
+    assert db._transaction_depth == 0
+
+
+def test_bulk_insert_empty_rows():
+    db, log = _fake_db()
+    db.cursor = ChunkCursor(log)
+
+    assert db.bulk_insert("generated_codes", ["code"], []) == 0
+    assert db.cursor.chunks == []
+
+
+class RoutineDeniedCursor(FakeCursor):
+    """Cursor sin privilegio CREATE ROUTINE."""
+
+    def execute(self, query, params=()):
+        if query.startswith("CREATE PROCEDURE"):
+            raise Error("CREATE ROUTINE command denied")
+        super().execute(query, params)
+
+
+def test_dashboard_procedure_failure_is_tolerated():
+    db, log = _fake_db()
+    db.cursor = RoutineDeniedCursor(log)
+
+    assert db._ensure_dashboard_procedure() is False
+    assert log == [("execute", "DROP PROCEDURE IF EXISTS sp_refresh_dashboard_stats")]
+
+
+def test_dashboard_procedure_created():
+    db, log = _fake_db()
+
+    assert db._ensure_dashboard_procedure() is True
+    assert log[-1] == ("execute", Database._DASHBOARD_PROCEDURE_SQL)
+
+
+def test_existing_codes_locks_keys():
+    db, log = _fake_db()
+
+    assert db.existing_codes(["A1", "B2"], for_update=True) == set()
+    assert log == [("execute",
+                    "SELECT code FROM generated_codes WHERE code IN (%s, %s) FOR UPDATE")]
+    assert db.existing_codes([]) == set()
+    assert len(log) == 1
+
+
+def test_upsert_updates_serial_and_service_of_existing_code():
+    db, log = _fake_db()
+    db.cursor.lastrowid = 7
+
+    assert db.upsert_generated_code("ABCD123456", "S1 - Agua", "S1", "Agua") == 7
+
+    query = log[0][1]
+    assert "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)" in query
+    assert "meter_serial = VALUES(meter_serial)" in query
+    assert "service_type = VALUES(service_type)" in query
+    assert log[-1] == ("commit",)
@@ -0,0 +1,82 @@
+"""
+Pruebas unitarias del guardado por lotes de CodeGenerator.generate_batch.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from modules.code_generator.services import unique_code_gen
+from modules.code_generator.services.unique_code_gen import CodeGenerator
+
+
+class FakeDatabase:
+    """BD mínima: `taken` simula códigos insertados por otra sesión."""
+
+    def __init__(self, taken=(), shortfall=0, fail=False):
+        self.taken = set(taken)
+        self.shortfall = shortfall
+        self.fail = fail
+        self.saved = []
+        self.rolled_back = False
+
+    def code_exists(self, code):
+        return False
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield self
+        except Exception:
+            self.rolled_back = True
+            raise
+
+    def existing_codes(self, codes, for_update=False):
+        assert for_update
+        return {code for code in codes if code in self.taken}
+
+    def save_generated_codes_bulk(self, rows):
+        if self.fail:
+            raise RuntimeError("conexión perdida")
+        self.saved.extend(rows)
+        return len(rows) - self.shortfall
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(unique_code_gen, "log_operation", lambda **kwargs: None)
+    codes = iter(f"ABCD{i:06d}" for i in range(100))
+    gen = CodeGenerator.__new__(CodeGenerator)
+    monkeypatch.setattr(gen, "generate_code", lambda prefix="": (True, next(codes)))
+    return gen
+
+
+def test_batch_saved(generator):
+    generator.db = FakeDatabase()
+
+    codes, errors = generator.generate_batch(3)
+
+    assert codes == ["ABCD000000", "ABCD000001", "ABCD000002"]
+    assert errors == []
+    assert [row[0] for row in generator.db.saved] == codes
+
+
+def test_codes_taken_by_other_session_are_errors(generator):
+    generator.db = FakeDatabase(taken={"ABCD000001"})
+
+    codes, errors = generator.generate_batch(3)
+
+    assert codes == ["ABCD000000", "ABCD000002"]
+    assert len(errors) == 1 and "ABCD000001" in errors[0]
+    assert [row[0] for row in generator.db.saved] == codes
+
+
+@pytest.mark.parametrize("db", [FakeDatabase(fail=True), FakeDatabase(shortfall=1)])
+def test_failed_batch_not_reported_as_persisted(generator, db):
+    generator.db = db
+
+    codes, errors = generator.generate_batch(3)
+
+    assert codes == []
+    assert len(errors) == 3
+    assert db.rolled_back
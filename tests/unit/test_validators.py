@@ -0,0 +1,135 @@
+"""
+Pruebas unitarias de core.utils.validators.
+"""
+
+import struct
+
+import pytest
+
+from core.utils.validators import (
+    _sniff_image_format,
+    validate_image_file,
+    validate_inacal_code,
+    validate_pdf_file,
+)
+
+
+def _bmp_header(dib_size=40, pixel_offset=54):
+    """Cabecera BMP mínima: BITMAPFILEHEADER + tamaño de la cabecera DIB."""
+    return b'BM' + struct.pack('<IHHII', 1000, 0, 0, pixel_offset, dib_size)
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b'\x89PNG\r\n\x1a\n' + b'\x00' * 10, 'PNG'),
+    (b'\xff\xd8\xff\xe0' + b'\x00' * 14, 'JPEG'),
+    (b'GIF89a' + b'\x00' * 12, 'GIF'),
+    (b'II*\x00' + b'\x00' * 14, 'TIFF'),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8 ' + b'\x00' * 2, 'WEBP'),
+    (_bmp_header(), 'BMP'),
+    (_bmp_header(dib_size=124, pixel_offset=138), 'BMP'),
+])
+def test_sniff_known_formats(tmp_path, head, expected):
+    path = tmp_path / "imagen"
+    path.write_bytes(head)
+
+    assert _sniff_image_format(path) == expected
+
+
+@pytest.mark.parametrize("head", [
+    b'BM cualquier texto que empieza con BM',
+    _bmp_header(dib_size=99),
+    _bmp_header(dib_size=40, pixel_offset=20),
+    b'BM',
+    b'texto plano',
+])
+def test_sniff_rejects_fake_bmp_and_unknown(tmp_path, head):
+    path = tmp_path / "archivo"
+    path.write_bytes(head)
+
+    assert _sniff_image_format(path) is None
+
+
+def test_fake_bmp_is_not_a_valid_image(tmp_path):
+    path = tmp_path / "falso.bmp"
+    path.write_bytes(b'BM esto no es una imagen' * 4)
+
+    valid, _ = validate_image_file(path, allowed_formats=['BMP', 'PNG'])
+
+    assert not valid
+
+
+def test_image_format_not_allowed(tmp_path):
+    path = tmp_path / "imagen.png"
+    path.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 10)
+
+    assert validate_image_file(path, allowed_formats=['PNG'])[0]
+    assert not validate_image_file(path, allowed_formats=['JPEG'])[0]
+
+
+def test_missing_image(tmp_path):
+    valid, msg = validate_image_file(tmp_path / "no_existe.png")
+
+    assert not valid
+    assert "no existe" in msg
+
+
+@pytest.mark.parametrize("code", ["ABC1234567", "A000000000", "ABCDEFGHIJ", "ÁBC1234567"])
+def test_inacal_code_valid(code):
+    assert validate_inacal_code(code) == (True, "")
+
+
+@pytest.mark.parametrize("code, message", [
+    ("", "El código está vacío"),
+    (None, "El código está vacío"),
+    ("   ", "El código está vacío"),
+    ("ABC123456", "El código debe tener exactamente 10 caracteres"),
+    ("ABC12345678", "El código debe tener exactamente 10 caracteres"),
+    ("abc1234567", "El código debe estar en mayúsculas"),
+    ("1234567890", "El código debe estar en mayúsculas"),
+    ("ABC-123456", "El código debe contener solo letras y números"),
+    ("ABC 123456", "El código debe contener solo letras y números"),
+    ("ABC123456\n", "El código debe contener solo letras y números"),
+])
+def test_inacal_code_invalid(code, message):
+    assert validate_inacal_code(code) == (False, message)
+
+
+@pytest.mark.parametrize("name", ["doc.pdf", "DOC.PDF"])
+def test_pdf_valid(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    assert validate_pdf_file(path) == (True, "")
+
+
+def test_pdf_wrong_extension(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"%PDF-1.7\n")
+
+    assert validate_pdf_file(path) == (False, "Extensión no permitida. Se esperaba: .pdf")
+
+
+@pytest.mark.parametrize("content", [b"", b"%PDF", b"<html>%PDF-1.7", b"\x00%PDF-1.7"])
+def test_pdf_bad_header(tmp_path, content):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(content)
+
+    assert validate_pdf_file(path) == (False, "El archivo no es un PDF válido (header incorrecto)")
+
+
+def test_pdf_missing(tmp_path):
+    path = tmp_path / "falta.pdf"
+
+    ok, message = validate_pdf_file(path)
+
+    assert not ok
+    assert message.startswith("El archivo no existe")
+
+
+def test_pdf_directory(tmp_path):
+    path = tmp_path / "carpeta.pdf"
+    path.mkdir()
+
+    ok, message = validate_pdf_file(path)
+
+    assert not ok